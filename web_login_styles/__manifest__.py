@@ -21,7 +21,7 @@
 ###############################################################################
 {
     'name': 'Customize Login Page Style',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.0.7',
     'category': 'Extra Tools',
     'summary': 'Customize The Login Page With Different Styles',
     'description': 'The Module helps to customize login page with different '
@@ -32,6 +32,8 @@
     'website': 'https://www.cybrosys.com',
     'depends': ['base','base_setup','web'],
     'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/res_config_settings_views.xml',
         'views/webclient_templates_right.xml',
         'views/webclient_templates_left.xml',
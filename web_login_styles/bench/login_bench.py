@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Mohammed Dilshad Tk (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Load test of /web/login for every orientation and background mode.
+
+The script drives a running Odoo server where web_login_styles is
+installed. For each combination of orientation and background it saves the
+settings through XML-RPC, then times GET requests, failed POSTs and
+successful POSTs of the login page, and writes the results as JSON so runs
+of different module versions can be compared:
+
+    python3 login_bench.py --url http://localhost:8069 --db bench \\
+        --login admin --password admin --requests 200 --concurrency 4 \\
+        --server-log /var/log/odoo/odoo.log --server-pid 1234 \\
+        --data-dir ~/.local/share/Odoo --output login_bench.json
+
+SQL queries per request are read from the werkzeug lines of the server log
+(--server-log), the memory of the server and its workers from /proc
+(--server-pid) and the filestore growth from --data-dir. Each of them is
+reported as null when its option is not given. The login page settings in
+place before the run are restored at the end.
+"""
+import argparse
+import base64
+import datetime
+import json
+import math
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import xmlrpc.client
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ORIENTATIONS = ('default', 'left', 'middle', 'right')
+BACKGROUNDS = ('color', 'image', 'url')
+SCENARIOS = ('get', 'post_failure', 'post_success')
+SETTINGS_FIELDS = ('orientation', 'background', 'color', 'url', 'image',
+                   'login_throttle')
+CSRF_RE = re.compile(r'name="csrf_token"\s+value="([^"]+)"')
+# "POST /web/login HTTP/1.1" 200 - <queries> <query time> <remaining time>
+LOG_RE = re.compile(r'"(GET|POST) /web/login[ ?][^"]*" \d{3} - (\d+) ')
+
+
+class OdooRpc:
+    """Minimal XML-RPC client of the benchmarked server."""
+
+    def __init__(self, url, db, login, password):
+        common = xmlrpc.client.ServerProxy(url + '/xmlrpc/2/common')
+        self.server_version = common.version()['server_version']
+        self.uid = common.authenticate(db, login, password, {})
+        if not self.uid:
+            sys.exit("Could not authenticate %s on %s" % (login, db))
+        self.db = db
+        self.password = password
+        self.models = xmlrpc.client.ServerProxy(url + '/xmlrpc/2/object',
+                                                allow_none=True)
+        # Older versions of the module lack some settings, login_throttle
+        # only exists since 17.0.1.0.5
+        self.settings_fields = tuple(self.call(
+            'res.config.settings', 'fields_get', list(SETTINGS_FIELDS),
+            attributes=['type']))
+
+    def call(self, model, method, *args, **kwargs):
+        """Call 'method' of 'model' on the server."""
+        return self.models.execute_kw(self.db, self.uid, self.password,
+                                      model, method, list(args), kwargs)
+
+    def module_version(self):
+        """Return the installed version of web_login_styles."""
+        modules = self.call('ir.module.module', 'search_read',
+                            [('name', '=', 'web_login_styles')],
+                            fields=['latest_version'])
+        return modules[0]['latest_version'] if modules else None
+
+    def read_settings(self):
+        """Return the current login page settings."""
+        return self.call('res.config.settings', 'default_get',
+                         list(self.settings_fields))
+
+    def save_settings(self, values):
+        """Save the login page settings the way the settings form does,
+           leaving out the ones the installed version does not have."""
+        values = {field: value for field, value in values.items()
+                  if field in self.settings_fields}
+        settings_id = self.call('res.config.settings', 'create', values)
+        self.call('res.config.settings', 'execute', [settings_id])
+
+    def attachment_usage(self):
+        """Return the number and total size of the attachments."""
+        groups = self.call('ir.attachment', 'read_group', [],
+                           ['file_size:sum'], [])
+        if not groups:
+            return 0, 0
+        return groups[0]['__count'], groups[0]['file_size'] or 0
+
+
+def make_png(width=1920, height=1080):
+    """Return a gradient PNG, the background image when --image is not
+       given."""
+    rows = b''.join(
+        b'\x00' + b''.join(bytes((x * 255 // width, y * 255 // height, 160))
+                           for x in range(width))
+        for y in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data)))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(rows, 6)) + chunk(b'IEND', b''))
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile 'pct' of 'values'."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def directory_size(path):
+    """Return the size in bytes of the files under 'path'."""
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def server_rss(pid):
+    """Return the resident memory in KiB of process 'pid' and of all its
+       children, the workers of a prefork server."""
+    pids, total = [pid], 0
+    while pids:
+        pid = pids.pop()
+        try:
+            with open('/proc/%d/status' % pid) as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+            for tid in os.listdir('/proc/%d/task' % pid):
+                with open('/proc/%d/task/%s/children' % (pid, tid)) as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return total
+
+
+class LoginBench:
+    """Run the login page scenarios against the server."""
+
+    def __init__(self, args):
+        self.args = args
+        self.local = threading.local()
+
+    def new_session(self):
+        """Return an HTTP session bound to the benchmarked database and
+           the CSRF token of its login page."""
+        session = requests.Session()
+        response = session.get(self.args.url + '/web/login',
+                               params={'db': self.args.db})
+        match = CSRF_RE.search(response.text)
+        return session, match and match.group(1)
+
+    def thread_session(self):
+        """Return the session of the current thread, for anonymous
+           requests."""
+        if not hasattr(self.local, 'session'):
+            self.local.session = self.new_session()
+        return self.local.session
+
+    def post(self, session, csrf_token, password):
+        """Time a login POST, return its duration and response."""
+        start = time.perf_counter()
+        response = session.post(self.args.url + '/web/login', data={
+            'login': self.args.login,
+            'password': password,
+            'csrf_token': csrf_token,
+            'redirect': '',
+        }, allow_redirects=False)
+        return time.perf_counter() - start, response
+
+    def get(self, _index):
+        session, _csrf_token = self.thread_session()
+        start = time.perf_counter()
+        response = session.get(self.args.url + '/web/login')
+        return time.perf_counter() - start, response.status_code == 200
+
+    def post_failure(self, _index):
+        session, csrf_token = self.thread_session()
+        duration, response = self.post(session, csrf_token,
+                                       self.args.password + '-wrong')
+        return duration, response.status_code == 200
+
+    def post_success(self, _index):
+        session, csrf_token = self.new_session()
+        duration, response = self.post(session, csrf_token,
+                                       self.args.password)
+        return duration, response.status_code in (302, 303)
+
+    def run_scenario(self, scenario):
+        """Run 'scenario' --requests times and return its statistics."""
+        log_offset = self.log_size()
+        with ThreadPoolExecutor(self.args.concurrency) as executor:
+            samples = list(executor.map(getattr(self, scenario),
+                                        range(self.args.requests)))
+        durations = [duration * 1000 for duration, _ok in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for _duration, ok in samples if not ok),
+            'latency_ms': {
+                'mean': round(sum(durations) / len(durations), 3),
+                'p50': round(percentile(durations, 50), 3),
+                'p95': round(percentile(durations, 95), 3),
+                'p99': round(percentile(durations, 99), 3),
+            },
+            'sql_queries': self.logged_queries(
+                log_offset, 'GET' if scenario == 'get' else 'POST'),
+        }
+
+    def log_size(self):
+        if not self.args.server_log:
+            return None
+        return os.path.getsize(self.args.server_log)
+
+    def logged_queries(self, offset, method):
+        """Return the SQL queries per request of the login page 'method'
+           requests logged by the server since 'offset'."""
+        if offset is None:
+            return None
+        time.sleep(0.5)  # let the server flush its log
+        with open(self.args.server_log, errors='replace') as log:
+            log.seek(offset)
+            counts = [int(match.group(2)) for match in map(LOG_RE.search, log)
+                      if match and match.group(1) == method]
+        if not counts:
+            return None
+        return {'mean': round(sum(counts) / len(counts), 2),
+                'max': max(counts)}
+
+    def usage(self, rpc):
+        """Return the attachment, filestore and memory usage."""
+        count, size = rpc.attachment_usage()
+        filestore = None
+        if self.args.data_dir:
+            filestore = directory_size(os.path.join(
+                os.path.expanduser(self.args.data_dir), 'filestore',
+                self.args.db))
+        return {
+            'attachments': count,
+            'attachment_bytes': size,
+            'filestore_bytes': filestore,
+            'rss_kib': (server_rss(self.args.server_pid)
+                        if self.args.server_pid else None),
+        }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--login', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--requests', type=int, default=100,
+                        help="Requests per scenario and combination")
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--image', help="Background image file, a generated "
+                                        "1920x1080 PNG by default")
+    parser.add_argument('--background-url',
+                        help="Background image URL, the Odoo logo of the "
+                             "server by default")
+    parser.add_argument('--server-log', help="Log file of the server")
+    parser.add_argument('--server-pid', type=int,
+                        help="Process id of the server")
+    parser.add_argument('--data-dir', help="Data directory of the server")
+    parser.add_argument('--output', help="JSON result file, stdout by "
+                                         "default")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.url = args.url.rstrip('/')
+    if args.image:
+        with open(args.image, 'rb') as image_file:
+            image = base64.b64encode(image_file.read()).decode()
+    else:
+        image = base64.b64encode(make_png()).decode()
+    rpc = OdooRpc(args.url, args.db, args.login, args.password)
+    bench = LoginBench(args)
+    report = {
+        'module_version': rpc.module_version(),
+        'server_version': rpc.server_version,
+        'started_at': datetime.datetime.now(
+            datetime.timezone.utc).isoformat(),
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'runs': [],
+    }
+    original_settings = rpc.read_settings()
+    try:
+        for orientation in ORIENTATIONS:
+            for background in BACKGROUNDS:
+                rpc.save_settings({
+                    'orientation': orientation,
+                    'background': background,
+                    'color': '#875A7B',
+                    'url': (args.background_url or
+                            args.url + '/web/static/img/logo.png'),
+                    'image': image,
+                    # the failed login scenario would lock the bench out
+                    'login_throttle': False,
+                })
+                before = bench.usage(rpc)
+                scenarios = {scenario: bench.run_scenario(scenario)
+                             for scenario in SCENARIOS}
+                after = bench.usage(rpc)
+                report['runs'].append({
+                    'orientation': orientation,
+                    'background': background,
+                    'scenarios': scenarios,
+                    'growth': {
+                        key: (None if before[key] is None
+                              else after[key] - before[key])
+                        for key in ('attachments', 'attachment_bytes',
+                                    'filestore_bytes')
+                    },
+                    'rss_kib': {'before': before['rss_kib'],
+                                'after': after['rss_kib']},
+                })
+                print("%-8s %-6s GET p50 %.1f ms" % (
+                    orientation, background,
+                    scenarios['get']['latency_ms']['p50']), file=sys.stderr)
+    finally:
+        rpc.save_settings({field: original_settings.get(field)
+                           for field in rpc.settings_fields})
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
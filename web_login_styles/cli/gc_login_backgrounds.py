@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Mohammed Dilshad Tk (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import argparse
+import json
+import sys
+
+import odoo
+from odoo import api, SUPERUSER_ID
+from odoo.cli import Command
+from odoo.tools import config
+
+from odoo.addons.web_login_styles.models.ir_attachment import GC_BATCH_SIZE
+
+
+class GcLoginBackgrounds(Command):
+    """Remove the login page backgrounds that are not served anymore"""
+    name = 'gc_login_backgrounds'
+
+    def run(self, cmdargs):
+        """Remove the unused login background attachments of the database
+           and print the rows and bytes freed as JSON."""
+        parser = argparse.ArgumentParser(
+            prog='odoo-bin {}'.format(self.name),
+            description=self.__doc__,
+            epilog="Any other option is passed to the Odoo configuration, "
+                   "e.g. -c odoo.conf -d mydb.")
+        parser.add_argument('--batch-size', type=int, default=GC_BATCH_SIZE,
+                            help="Attachments removed per transaction "
+                                 "(default: %(default)s)")
+        args, odoo_args = parser.parse_known_args(cmdargs)
+        config.parse_config(odoo_args)
+        if not config['db_name']:
+            sys.exit("Missing database, use -d or --database")
+        odoo.service.server.load_server_wide_modules()
+        registry = odoo.registry(config['db_name'])
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            result = env['ir.attachment']._gc_login_backgrounds(
+                batch_size=args.batch_size, auto_commit=True)
+        print(json.dumps(result))
@@ -19,14 +19,16 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-import hashlib
+from markupsafe import escape
 import odoo
 from odoo import http
-from odoo.tools import pycompat
 from odoo.tools.translate import _
 from odoo.http import request
 from odoo.addons.web.controllers.home import Home as WebHome
 from odoo.addons.web.controllers.utils import ensure_db, _get_login_redirect_url
+from odoo.addons.web_login_styles.controllers.utils import (
+    cached_db_list, LoginTimer, NO_LOGIN_TIMER)
+from odoo.addons.web_login_styles.models.ir_ui_view import CSRF_PLACEHOLDER
 
 # Shared parameters for all login/signup flows
 SIGN_UP_REQUEST_PARAMS = {'db', 'login', 'debug', 'token', 'message', 'error',
@@ -34,6 +36,18 @@ SIGN_UP_REQUEST_PARAMS = {'db', 'login', 'debug', 'token', 'message', 'error',
                           'email', 'name', 'partner_id', 'password',
                           'confirm_password', 'city', 'country_id', 'lang'}
 
+# Login page templates of the orientations
+LOGIN_TEMPLATES = {
+    'right': 'web_login_styles.login_template_right',
+    'left': 'web_login_styles.login_template_left',
+    'middle': 'web_login_styles.login_template_middle',
+}
+# Values of the login page templates shared by all anonymous visitors
+LOGIN_PAGE_VALUES = ('databases', 'disable_database_manager', 'debug',
+                     'bg_img', 'bg_srcset', 'bg_srcset_webp', 'color')
+# Values of the login page templates injected per request
+LOGIN_PAGE_PLACEHOLDERS = ('login', 'error', 'message', 'redirect', 'db')
+
 
 class Home(WebHome):
     @http.route(route='/web/login', type='http', auth="none")
@@ -45,24 +59,42 @@ class Home(WebHome):
             return request.redirect(redirect)
         if not request.uid:
             request.update_env(user=odoo.SUPERUSER_ID)
+        style = request.env['res.config.settings'].sudo()._get_login_style()
+        timer = LoginTimer() if style['timing'] else NO_LOGIN_TIMER
         values = {val: item for val, item in request.params.items() if
                   val in SIGN_UP_REQUEST_PARAMS}
-        try:
-            values['databases'] = http.db_list()
-        except odoo.exceptions.AccessDenied:
-            values['databases'] = None
+        with timer.span('db_list'):
+            try:
+                values['databases'] = cached_db_list()
+            except odoo.exceptions.AccessDenied:
+                values['databases'] = None
 
+        retry_after = 0
         if request.httprequest.method == 'POST':
             old_uid = request.update_env(user=request.session.uid)
-
+            if style['throttle']:
+                throttle = request.env['web.login.throttle'].sudo()
+                throttle_keys = throttle._get_keys(
+                    request.httprequest.remote_addr, request.params['login'])
+                with timer.span('throttle'):
+                    retry_after = throttle._get_retry_after(throttle_keys)
             try:
-                uid = request.session.authenticate(request.session.db,
-                                                   request.params['login'],
-                                                   request.params['password'])
+                if retry_after:
+                    raise odoo.exceptions.AccessDenied(_(
+                        "Too many failed login attempts, please try again "
+                        "in %s seconds.", retry_after))
+                with timer.span('authenticate'):
+                    uid = request.session.authenticate(
+                        request.session.db, request.params['login'],
+                        request.params['password'])
+                if style['throttle']:
+                    throttle._register_success(throttle_keys)
                 request.params['login_success'] = True
-                return request.redirect(
-                    self._login_redirect(uid, redirect=redirect))
+                return timer.apply(request.redirect(
+                    self._login_redirect(uid, redirect=redirect)))
             except odoo.exceptions.AccessDenied as e:
+                if style['throttle'] and not retry_after:
+                    throttle._register_failure(throttle_keys)
                 request.update_env = old_uid
                 if e.args == odoo.exceptions.AccessDenied().args:
                     values['error'] = _("Wrong login/password")
@@ -78,59 +110,56 @@ class Home(WebHome):
             values['login'] = request.session.get('auth_login')
         if not odoo.tools.config['list_db']:
             values['disable_database_manager'] = True
-        conf_param = request.env['ir.config_parameter'].sudo()
-        orientation = conf_param.get_param('web_login_styles.orientation')
-        image = conf_param.get_param('web_login_styles.image')
-        url = conf_param.get_param('web_login_styles.url')
-        background_type = conf_param.get_param('web_login_styles.background')
+        orientation = style['orientation']
+        background_type = style['background']
         if background_type == 'color':
             values['bg'] = ''
-            values['color'] = conf_param.sudo().get_param(
-                'web_login_styles.color')
+            values['color'] = style['color']
         elif background_type == 'image':
-            exist_rec = request.env['ir.attachment'].sudo().search(
-                [('is_background', '=', True)])
-            if exist_rec:
-                exist_rec.unlink()
-            attachments = request.env['ir.attachment'].sudo().create({
-                'name': 'Background Image',
-                'datas': image,
-                'type': 'binary',
-                'mimetype': 'image/png',
-                'public': True,
-                'is_background': True
-            })
-            base_url = conf_param.sudo().get_param('web.base.url')
-            url = base_url + '/web/image?' + 'model=ir.attachment&id=' + str(
-                attachments.id) + '&field=datas'
-            values['bg_img'] = url or ''
+            values['bg_img'] = style['bg_img'] or ''
+            values['bg_srcset'] = style['bg_srcset']
+            values['bg_srcset_webp'] = style['bg_srcset_webp']
         elif background_type == 'url':
-            pre_exist = request.env['ir.attachment'].sudo().search(
-                [('url', '=', url)])
-            if not pre_exist:
-                attachments = request.env['ir.attachment'].sudo().create({
-                    'name': 'Background Image URL',
-                    'url': url,
-                    'type': 'url',
-                    'public': True
-                })
+            values['bg_img'] = style['url_img'] or ''
+        template = LOGIN_TEMPLATES.get(orientation)
+        with timer.span('render'):
+            if not template:
+                response = request.render('web.login', values)
+            elif request.session.uid:
+                response = request.render(template, values)
             else:
-                attachments = pre_exist
-            encode = hashlib.md5(
-                pycompat.to_text(attachments.url).encode("utf-8")).hexdigest()[
-                     0:7]
-            encode_url = "/web/image/{}-{}".format(attachments.id, encode)
-            values['bg_img'] = encode_url or ''
-        if orientation == 'right':
-            response = request.render('web_login_styles.login_template_right',
-                                      values)
-        elif orientation == 'left':
-            response = request.render('web_login_styles.login_template_left',
-                                      values)
-        elif orientation == 'middle':
-            response = request.render('web_login_styles.login_template_middle',
-                                      values)
-        else:
-            response = request.render('web.login', values)
+                response = self._render_login_page(template, values)
+            if style['timing']:
+                # request.render() is lazy, render the QWeb template now
+                response.flatten()
         response.headers['X-Frame-Options'] = 'DENY'
-        return response
+        if retry_after:
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+        return timer.apply(response)
+
+    def _render_login_page(self, template, values):
+        """Render an orientation template for an anonymous visitor from its
+           cached copy, then inject the CSRF token and the values of the
+           request into it."""
+        page_values = {name: values.get(name) for name in LOGIN_PAGE_VALUES}
+        page_values['debug'] = bool(page_values['debug'])
+        if page_values['databases']:
+            page_values['databases'] = tuple(page_values['databases'])
+        placeholders = {
+            name: '__web_login_styles_{}__'.format(name)
+            for name in LOGIN_PAGE_PLACEHOLDERS if values.get(name)
+        }
+        page_values.update(placeholders)
+        # The page is rendered in the layout, assets and logo of the
+        # website (when installed) and of the company of the request
+        website = getattr(request, 'website', None)
+        key = (website.id if website else None, request.env.company.id,
+               request.env.lang, request.session.debug,
+               tuple(sorted(page_values.items())))
+        html = request.env['ir.ui.view']._render_login_page(
+            template, key, page_values)
+        html = html.replace(CSRF_PLACEHOLDER, request.csrf_token())
+        for name, placeholder in placeholders.items():
+            html = html.replace(placeholder, str(escape(values[name])))
+        return request.make_response(html)
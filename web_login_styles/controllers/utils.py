@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Mohammed Dilshad Tk (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import contextlib
+import json
+import logging
+import threading
+import time
+
+from odoo import http
+from odoo.http import request
+
+_logger = logging.getLogger(__name__)
+
+# Seconds during which the database list of the login page is reused. The
+# cache is per worker process and is not invalidated by the database
+# manager: a database created, restored or dropped shows up in, or
+# disappears from, the list of every worker within this delay.
+DB_LIST_TTL = 60
+
+_db_list_cache = {}
+_db_list_lock = threading.Lock()
+
+
+def cached_db_list():
+    """Return http.db_list() for the host of the request, reusing the
+       result fetched in the last DB_LIST_TTL seconds by this worker."""
+    host = request.httprequest.environ.get('HTTP_HOST', '')
+    now = time.monotonic()
+    with _db_list_lock:
+        expiry, databases = _db_list_cache.get(host, (0, None))
+        if expiry > now:
+            return list(databases)
+    databases = http.db_list()
+    with _db_list_lock:
+        _db_list_cache[host] = (now + DB_LIST_TTL, tuple(databases))
+    return databases
+
+
+class LoginTimer:
+    """Time the steps of a login page request and count the queries they
+       run on the request cursor. Authentication checks the password on a
+       cursor of its own, its queries are not counted."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Measure the step 'name' run inside the context."""
+        cr = request.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, (time.perf_counter() - start) * 1000,
+                               cr.sql_log_count - queries))
+
+    def apply(self, response):
+        """Add the measured steps to 'response' as a Server-Timing header
+           and log them as one JSON record."""
+        total = (time.perf_counter() - self.start) * 1000
+        response.headers['Server-Timing'] = ', '.join(
+            '{};dur={:.2f};desc="{} queries"'.format(name, duration, queries)
+            for name, duration, queries in self.spans
+        ) + ', total;dur={:.2f}'.format(total)
+        _logger.info("%s", json.dumps({
+            'event': 'web_login_timing',
+            'method': request.httprequest.method,
+            'status': response.status_code,
+            'total_ms': round(total, 2),
+            'spans': {name: {'ms': round(duration, 2), 'queries': queries}
+                      for name, duration, queries in self.spans},
+        }))
+        return response
+
+
+class NoLoginTimer:
+    """Stand-in of LoginTimer when the login timing is disabled."""
+    _span = contextlib.nullcontext()
+
+    def span(self, name):
+        return self._span
+
+    def apply(self, response):
+        return response
+
+
+NO_LOGIN_TIMER = NoLoginTimer()
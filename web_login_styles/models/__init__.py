@@ -21,4 +21,5 @@
 ###############################################################################
 from . import res_config_settings
 from . import ir_attachment
-
+from . import ir_ui_view
+from . import web_login_throttle
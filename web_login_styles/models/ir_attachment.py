@@ -19,7 +19,44 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-from odoo import fields, models
+import base64
+import hashlib
+import io
+import logging
+import re
+
+import requests
+from PIL import Image
+
+from odoo import api, fields, models
+from odoo.tools.image import ImageProcess
+from odoo.tools.mimetypes import guess_mimetype
+
+_logger = logging.getLogger(__name__)
+
+# Viewport widths of the resized login backgrounds
+BACKGROUND_WIDTHS = (640, 1280, 1920)
+# Formats of the resized login backgrounds as (Pillow format, mimetype,
+# extension, configuration parameter of their srcset)
+BACKGROUND_FORMATS = (
+    ('WEBP', 'image/webp', 'webp', 'web_login_styles.background_srcset_webp'),
+    ('JPEG', 'image/jpeg', 'jpg', 'web_login_styles.background_srcset'),
+)
+BACKGROUND_QUALITY = 80
+# Name of the attachments of the background image URL
+BACKGROUND_URL_NAME = 'Background Image URL'
+# Limits when mirroring the background image URL locally
+MIRROR_TIMEOUT = 10
+MIRROR_MAX_SIZE = 10 * 1024 * 1024
+# Attachments removed per transaction by the background garbage collection
+GC_BATCH_SIZE = 1000
+# Configuration parameters holding the URLs of the live backgrounds
+BACKGROUND_URL_PARAMS = (
+    'web_login_styles.background_image_url',
+    'web_login_styles.background_url_image',
+) + tuple(param for _format, _mimetype, _extension, param
+          in BACKGROUND_FORMATS)
+BACKGROUND_ID_RE = re.compile(r'/web/image/(\d+)-')
 
 
 class IrAttachment(models.Model):
@@ -28,3 +65,216 @@ class IrAttachment(models.Model):
 
     is_background = fields.Boolean(string="Is Background", default=False,
                                    help="To check is background option added")
+
+    def _get_background_url(self):
+        """Return the URL of the background attachment, made unique by its
+           checksum so browsers can cache it."""
+        self.ensure_one()
+        return '/web/image/{}-{}'.format(self.id, self.checksum[:8])
+
+    @api.model
+    def _get_login_background(self):
+        """Return the attachment holding the login page background image."""
+        attachment_id = self.env['ir.config_parameter'].sudo().get_param(
+            'web_login_styles.background_attachment_id')
+        return self.sudo().browse(int(attachment_id or 0)).exists()
+
+    @api.model
+    def _set_login_background(self, image):
+        """Store the base64 'image' as the login page background, along with
+           its resized variants. The attachments are only replaced when the
+           content changes, so the login page can keep serving them by id
+           and checksum."""
+        params = self.env['ir.config_parameter'].sudo()
+        current = self._get_login_background()
+        raw = base64.b64decode(image) if image else b''
+        if raw and current.checksum == self._compute_checksum(raw):
+            return current
+        self.sudo().search([('is_background', '=', True)]).unlink()
+        for _format, _mimetype, _extension, param in BACKGROUND_FORMATS:
+            params.set_param(param, False)
+        if not raw:
+            params.set_param('web_login_styles.background_attachment_id',
+                             False)
+            params.set_param('web_login_styles.background_image_url', False)
+            return self.browse()
+        attachment = self.sudo().create({
+            'name': 'Background Image',
+            'raw': raw,
+            'type': 'binary',
+            'public': True,
+            'is_background': True
+        })
+        params.set_param('web_login_styles.background_attachment_id',
+                         attachment.id)
+        params.set_param('web_login_styles.background_image_url',
+                         attachment._get_background_url())
+        self._create_login_background_variants(raw)
+        return attachment
+
+    @api.model
+    def _create_login_background_variants(self, raw):
+        """Resize the background image 'raw' to BACKGROUND_WIDTHS in each of
+           BACKGROUND_FORMATS and save the srcset of every format. All the
+           variants of a format are encoded before any attachment is
+           created, a format Pillow fails to encode is skipped."""
+        image = ImageProcess(raw).image
+        if not image:
+            return
+        params = self.env['ir.config_parameter'].sudo()
+        widths = sorted({min(width, image.width)
+                         for width in BACKGROUND_WIDTHS})
+        for image_format, mimetype, extension, param in BACKGROUND_FORMATS:
+            variants = []
+            for width in widths:
+                variant = image.resize(
+                    (width, round(image.height * width / image.width)),
+                    Image.LANCZOS)
+                if image_format == 'JPEG' and variant.mode != 'RGB':
+                    # Flatten transparent backgrounds onto white
+                    variant = variant.convert('RGBA')
+                    flat = Image.new('RGB', variant.size, (255, 255, 255))
+                    flat.paste(variant, mask=variant.getchannel('A'))
+                    variant = flat
+                elif variant.mode not in ('RGB', 'RGBA'):
+                    variant = variant.convert('RGBA')
+                stream = io.BytesIO()
+                try:
+                    variant.save(stream, image_format,
+                                 quality=BACKGROUND_QUALITY, optimize=True)
+                except (KeyError, OSError):
+                    # Pillow built without support for this format
+                    break
+                variants.append((width, stream.getvalue()))
+            else:
+                attachments = self.sudo().create([{
+                    'name': 'Background Image {}w.{}'.format(width,
+                                                             extension),
+                    'raw': content,
+                    'type': 'binary',
+                    'mimetype': mimetype,
+                    'public': True,
+                    'is_background': True
+                } for width, content in variants])
+                params.set_param(param, ', '.join(
+                    '{} {}w'.format(attachment._get_background_url(), width)
+                    for attachment, (width, content)
+                    in zip(attachments, variants)))
+
+    @api.model
+    def _set_login_background_url(self, url, mirror=False):
+        """Resolve the background image 'url' to an attachment, downloaded
+           into the filestore when 'mirror' is set, and save the URL the
+           login page serves it from. Attachments of previous URLs are
+           removed."""
+        params = self.env['ir.config_parameter'].sudo()
+        attachments = self.sudo().search([('name', '=', BACKGROUND_URL_NAME)])
+        attachment = attachments.filtered(
+            lambda a: a.url == url and (a.type == 'binary') == bool(mirror))[:1]
+        (attachments - attachment).unlink()
+        if not url:
+            params.set_param('web_login_styles.background_url_image', False)
+            return self.browse()
+        if not attachment and mirror:
+            attachment = self._mirror_login_background_url(url)
+        if not attachment:
+            attachment = self.sudo().create({
+                'name': BACKGROUND_URL_NAME,
+                'url': url,
+                'type': 'url',
+                'public': True
+            })
+        if attachment.type == 'binary':
+            image_url = attachment._get_background_url()
+        else:
+            image_url = '/web/image/{}-{}'.format(
+                attachment.id,
+                hashlib.md5(url.encode('utf-8')).hexdigest()[0:7])
+        params.set_param('web_login_styles.background_url_image', image_url)
+        return attachment
+
+    @api.model
+    def _mirror_login_background_url(self, url):
+        """Download the image at 'url' into a background attachment, or
+           return an empty recordset if it can not be fetched."""
+        try:
+            response = requests.get(url, timeout=MIRROR_TIMEOUT, stream=True)
+            response.raise_for_status()
+            raw = response.raw.read(MIRROR_MAX_SIZE + 1, decode_content=True)
+        except requests.RequestException as e:
+            _logger.warning("Could not mirror login background %s: %s",
+                            url, e)
+            return self.browse()
+        mimetype = guess_mimetype(raw)
+        if len(raw) > MIRROR_MAX_SIZE or not mimetype.startswith('image/'):
+            _logger.warning("Login background %s is not an image of at "
+                            "most %s bytes, it is not mirrored",
+                            url, MIRROR_MAX_SIZE)
+            return self.browse()
+        return self.sudo().create({
+            'name': BACKGROUND_URL_NAME,
+            'raw': raw,
+            'url': url,
+            'type': 'binary',
+            'mimetype': mimetype,
+            'public': True
+        })
+
+    @api.model
+    def _get_login_background_ids(self):
+        """Return the ids of the attachments the login page still serves,
+           read from the background URLs it renders."""
+        params = self.env['ir.config_parameter'].sudo()
+        ids = {int(params.get_param(
+            'web_login_styles.background_attachment_id') or 0)}
+        for param in BACKGROUND_URL_PARAMS:
+            ids.update(int(attachment_id) for attachment_id in
+                       BACKGROUND_ID_RE.findall(params.get_param(param) or ''))
+        ids.discard(0)
+        return ids
+
+    @api.model
+    def _gc_login_backgrounds(self, batch_size=GC_BATCH_SIZE,
+                              auto_commit=False):
+        """Remove the background and background URL attachments the login
+           page does not serve anymore, 'batch_size' at a time. With
+           'auto_commit' every batch is committed and the filestore is
+           garbage collected at the end, otherwise the files are left to
+           the daily autovacuum. Return the number of removed attachments
+           and the bytes they freed."""
+        domain = [
+            '|', ('is_background', '=', True),
+            ('name', '=', BACKGROUND_URL_NAME),
+            ('id', 'not in', list(self._get_login_background_ids())),
+        ]
+        rows = size = 0
+        while True:
+            attachments = self.sudo().search(domain, limit=batch_size,
+                                             order='id')
+            if not attachments:
+                break
+            # Files shared with other attachments stay in the filestore
+            self.env.cr.execute("""
+                SELECT COALESCE(SUM(file_size), 0) FROM (
+                    SELECT DISTINCT ON (COALESCE(a.store_fname, a.id::text))
+                           a.file_size
+                      FROM ir_attachment a
+                     WHERE a.id IN %(ids)s
+                       AND NOT EXISTS (
+                           SELECT 1 FROM ir_attachment b
+                            WHERE b.store_fname = a.store_fname
+                              AND b.id NOT IN %(ids)s)
+                ) AS freed
+            """, {'ids': tuple(attachments.ids)})
+            size += self.env.cr.fetchone()[0]
+            rows += len(attachments)
+            attachments.unlink()
+            if auto_commit:
+                self.env.cr.commit()
+            if len(attachments) < batch_size:
+                break
+        if auto_commit:
+            self._gc_file_store()
+        _logger.info("Removed %s unused login background attachments, "
+                     "%s bytes freed", rows, size)
+        return {'rows': rows, 'bytes': size}
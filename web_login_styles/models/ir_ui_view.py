@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Mohammed Dilshad Tk (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, models, tools
+from odoo.http import request
+
+# Stands for the CSRF token of the request in cached login pages
+CSRF_PLACEHOLDER = '__web_login_styles_csrf_token__'
+
+
+class IrUiView(models.Model):
+    """Inherit 'ir.ui.view' to cache the rendered login page templates"""
+    _inherit = 'ir.ui.view'
+
+    @api.model
+    @tools.ormcache('template', 'key', cache='templates.cached_values')
+    def _render_login_page(self, template, key, values):
+        """Render a login page template once per 'key', which must identify
+           'values'. The template is rendered with a placeholder for the
+           CSRF token of the request: the token changes every second, so
+           it could not be found again in the rendered page. The cache is
+           cleared when the settings or the views change."""
+        request.csrf_token = lambda *args, **kwargs: CSRF_PLACEHOLDER
+        try:
+            return str(self._render_template(template, values))
+        finally:
+            del request.csrf_token
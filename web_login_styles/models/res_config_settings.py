@@ -19,7 +19,21 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+from odoo.tools import frozendict
+
+# Settings of the login page exposed through the cached login style
+LOGIN_STYLE_PARAMS = {
+    'orientation': 'web_login_styles.orientation',
+    'background': 'web_login_styles.background',
+    'color': 'web_login_styles.color',
+    'bg_img': 'web_login_styles.background_image_url',
+    'bg_srcset': 'web_login_styles.background_srcset',
+    'bg_srcset_webp': 'web_login_styles.background_srcset_webp',
+    'url_img': 'web_login_styles.background_url_image',
+    'timing': 'web_login_styles.timing',
+    'throttle': 'web_login_styles.throttle',
+}
 
 
 class ResConfigSettings(models.TransientModel):
@@ -43,23 +57,59 @@ class ResConfigSettings(models.TransientModel):
                                                "of login page")
     url = fields.Char(string="URL", help="Select and url of image",
                       config_parameter="web_login_styles.url")
+    mirror_url = fields.Boolean(string="Mirror Image",
+                                help="Download the image of the URL and "
+                                     "serve it from this database",
+                                config_parameter="web_login_styles.mirror_url")
     color = fields.Char(string="Color", help="Set a colour for background "
                                              "of login page",
                         config_parameter="web_login_styles.color")
 
+    login_timing = fields.Boolean(string="Login Timing",
+                                  help="Measure the steps of the login page "
+                                       "in a Server-Timing header and in the "
+                                       "server log",
+                                  config_parameter="web_login_styles.timing")
+
+    login_throttle = fields.Boolean(string="Login Throttling",
+                                    help="Lock out logins and reject "
+                                         "client IP addresses after "
+                                         "repeated failed logins",
+                                    config_parameter="web_login_styles.throttle")
+
     @api.model
     def get_values(self):
         """Super the get_values function to get the field values."""
         res = super(ResConfigSettings, self).get_values()
-        params = self.env['ir.config_parameter'].sudo()
-        res.update(image=params.get_param('web_login_styles.image'))
+        res.update(
+            image=self.env['ir.attachment']._get_login_background().datas)
         return res
 
     def set_values(self):
         """Super the set_values function to save the field values."""
         super(ResConfigSettings, self).set_values()
+        self.env['ir.attachment']._set_login_background(self.image)
+        self.env['ir.attachment']._set_login_background_url(self.url,
+                                                            self.mirror_url)
+
+    @api.model
+    def _read_login_style(self):
+        """Read the login page style from the configuration parameters.
+           The base64 image itself is left out, the login page only needs
+           the URL of its attachment."""
         params = self.env['ir.config_parameter'].sudo()
-        params.set_param('web_login_styles.image', self.image)
+        return frozendict({
+            name: params.get_param(key)
+            for name, key in LOGIN_STYLE_PARAMS.items()
+        })
+
+    @api.model
+    @tools.ormcache()
+    def _get_login_style(self):
+        """Return the login page style, cached per database and worker.
+           Writing a configuration parameter clears the cache, so it
+           follows the login style settings."""
+        return self._read_login_style()
 
     @api.onchange('orientation')
     def onchange_orientation(self):
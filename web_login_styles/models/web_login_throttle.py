@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Mohammed Dilshad Tk (<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import hashlib
+import logging
+from datetime import timedelta
+
+from psycopg2.extensions import TransactionRollbackError
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Token buckets of failed logins per kind of key, as (capacity, tokens
+# refilled per second)
+THROTTLE_BUCKETS = {
+    'ip': (30, 1 / 60),
+    'login': (5, 1 / 300),
+}
+# Seconds a login is locked out once its bucket is empty, doubled on each
+# further failure up to THROTTLE_MAX_DELAY
+THROTTLE_BASE_DELAY = 30
+THROTTLE_MAX_DELAY = 3600
+# An IP address may be shared by many users behind a NAT or a proxy, so it
+# is never locked out: once its bucket is empty its login attempts are only
+# rejected until the bucket refills one token
+# Attempts to record a failure when concurrent workers update the same key
+THROTTLE_RETRIES = 3
+
+_REGISTER_FAILURE_QUERY = """
+    INSERT INTO web_login_throttle AS t (key, tokens, failures, last_failure)
+    VALUES (%(key)s, %(capacity)s - 1, 1, %(now)s)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = LEAST(%(capacity)s, t.tokens + %(rate)s * EXTRACT(
+            EPOCH FROM %(now)s - t.last_failure)) - 1,
+        failures = t.failures + 1,
+        last_failure = %(now)s
+    RETURNING tokens, failures
+"""
+
+
+class WebLoginThrottle(models.Model):
+    """Failed logins per client IP address and per login, shared by all
+       the workers through the database, to reject password guesses before
+       their hash is checked."""
+    _name = 'web.login.throttle'
+    _description = 'Login Throttle'
+    _log_access = False
+
+    key = fields.Char(string="Key", required=True,
+                      help="Client IP address or hashed login")
+    tokens = fields.Float(string="Tokens",
+                          help="Failed logins left before a lockout")
+    failures = fields.Integer(string="Failures",
+                              help="Failed logins since the last success")
+    last_failure = fields.Datetime(string="Last Failure")
+    blocked_until = fields.Datetime(string="Blocked Until")
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'The throttle key must be unique.'),
+    ]
+
+    @api.model
+    def _get_keys(self, remote_addr, login):
+        """Return the keys of a login attempt, with their kind."""
+        login_hash = hashlib.sha256(
+            (login or '').strip().lower().encode()).hexdigest()
+        return {
+            'ip:{}'.format(remote_addr): 'ip',
+            'login:{}'.format(login_hash): 'login',
+        }
+
+    @api.model
+    def _get_retry_after(self, keys):
+        """Return the seconds until a login attempt of 'keys' may be made
+           again, 0 when it is allowed: the lockout of the login, or the
+           time the empty bucket of the IP address takes to refill one
+           token."""
+        login_keys = tuple(key for key, kind in keys.items()
+                           if kind == 'login')
+        ip_keys = tuple(key for key, kind in keys.items() if kind == 'ip')
+        capacity, rate = THROTTLE_BUCKETS['ip']
+        now = fields.Datetime.now()
+        self.env.cr.execute("""
+            SELECT max(seconds) FROM (
+                SELECT EXTRACT(EPOCH FROM blocked_until - %(now)s) AS seconds
+                  FROM web_login_throttle
+                 WHERE key IN %(login_keys)s AND blocked_until > %(now)s
+                 UNION ALL
+                SELECT (1 - LEAST(%(capacity)s, tokens + %(rate)s * EXTRACT(
+                            EPOCH FROM %(now)s - last_failure))) / %(rate)s
+                  FROM web_login_throttle
+                 WHERE key IN %(ip_keys)s
+                   AND LEAST(%(capacity)s, tokens + %(rate)s * EXTRACT(
+                           EPOCH FROM %(now)s - last_failure)) < 1
+            ) AS waits
+        """, {'now': now, 'login_keys': login_keys, 'ip_keys': ip_keys,
+              'capacity': capacity, 'rate': rate})
+        seconds = self.env.cr.fetchone()[0]
+        return int(seconds) + 1 if seconds else 0
+
+    @api.model
+    def _register_failure(self, keys):
+        """Take a token from the bucket of each key and lock out the login
+           whose bucket is empty. It runs in a transaction of its own, so
+           the failure is kept whatever happens to the request. When the
+           failure can not be recorded, the login is let through rather
+           than failing the request."""
+        for attempt in range(THROTTLE_RETRIES):
+            try:
+                with self.pool.cursor() as cr:
+                    for key, kind in keys.items():
+                        self._take_token(cr, key, kind,
+                                         *THROTTLE_BUCKETS[kind])
+                return
+            except TransactionRollbackError:
+                if attempt == THROTTLE_RETRIES - 1:
+                    _logger.warning("Could not record a failed login after "
+                                    "%s attempts", THROTTLE_RETRIES)
+
+    @api.model
+    def _take_token(self, cr, key, kind, capacity, rate):
+        now = fields.Datetime.now()
+        cr.execute(_REGISTER_FAILURE_QUERY, {
+            'key': key, 'capacity': capacity, 'rate': rate, 'now': now,
+        })
+        tokens, failures = cr.fetchone()
+        if tokens < 1 and kind == 'login':
+            delay = min(THROTTLE_MAX_DELAY, THROTTLE_BASE_DELAY * 2 ** max(
+                0, failures - capacity))
+            cr.execute("""
+                UPDATE web_login_throttle SET blocked_until = %s
+                 WHERE key = %s
+            """, [now + timedelta(seconds=delay), key])
+
+    @api.model
+    def _register_success(self, keys):
+        """Forget the failures of the login keys, the IP address keeps its
+           bucket so one valid account can not reset it."""
+        login_keys = tuple(key for key, kind in keys.items()
+                           if kind == 'login')
+        with self.pool.cursor() as cr:
+            cr.execute("DELETE FROM web_login_throttle WHERE key IN %s",
+                       [login_keys])
+
+    @api.autovacuum
+    def _gc_login_throttle(self):
+        """Remove the keys without failure in the last day."""
+        self.env.cr.execute("""
+            DELETE FROM web_login_throttle
+             WHERE last_failure < %s
+               AND (blocked_until IS NULL OR blocked_until < %s)
+        """, [fields.Datetime.now() - timedelta(days=1),
+              fields.Datetime.now()])
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Website Career Application',
-    'version': '17.0.1.0.6',
+    'version': '17.0.1.0.20',
     'category': 'Website',
     'summary': 'Career Application Form for Website with comprehensive candidate data collection',
     'description': """
@@ -35,8 +35,12 @@
         'security/security.xml',
         'security/ir.model.access.csv',
         'data/master_data.xml',
+        'data/ir_cron_data.xml',
+        'data/mail_template_data.xml',
         'views/job_application_views.xml',
         'views/website_form_templates.xml',
+        'views/document_dedup_report_views.xml',
+        'views/application_job_views.xml',
     ],
     'assets': {
         'web.assets_frontend': [
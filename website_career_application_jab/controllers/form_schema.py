@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import re
+from collections import namedtuple
+
+from odoo import fields
+from odoo.addons.website_career_application_jab.models.application_rules import MAX_CHILDREN
+
+# Experience and education rows accepted in one application
+MAX_EXPERIENCES = 20
+MAX_EDUCATIONS = 20
+
+# A posted value of the form.
+#   kind: 'char', 'char_or_false', 'bool', 'int', 'date' or 'ids'
+#   gate: (field name, values) - the field is only read when the previously
+#         decoded gate field has one of the values, otherwise it is empty
+FormField = namedtuple('FormField', ['name', 'kind', 'gate'], defaults=[None])
+
+# A repeated section of the form, posted as <name>_<field>_<index>. Rows
+# without their required field are dropped, at most max_rows are read.
+FormSection = namedtuple('FormSection', ['name', 'fields', 'required', 'max_rows'])
+
+SPOUSE = ('has_spouse', (True,))
+RECOGNITION = ('recognition_status', ('evet', 'devam-ediyor'))
+
+APPLICATION_FIELDS = (
+    # Personal
+    FormField('full_name', 'char'),
+    FormField('gender', 'char'),
+    FormField('birth_date', 'date'),
+    FormField('birth_place', 'char'),
+    FormField('birth_country', 'char'),
+    FormField('marital_status', 'char'),
+
+    # Address
+    FormField('addr_mahalle', 'char'),
+    FormField('addr_cadde', 'char'),
+    FormField('addr_sokak', 'char'),
+    FormField('addr_apt_no', 'char'),
+    FormField('addr_daire_no', 'char'),
+    FormField('addr_postcode', 'char'),
+    FormField('addr_district', 'char'),
+    FormField('addr_city', 'char'),
+    FormField('addr_country', 'char'),
+
+    # Contact
+    FormField('phone', 'char'),
+    FormField('email', 'char'),
+
+    # Passport
+    FormField('passport_has', 'char'),
+    FormField('passport_no', 'char', ('passport_has', ('evet',))),
+    FormField('passport_valid_until', 'date', ('passport_has', ('evet',))),
+
+    # Disability
+    FormField('disability', 'char'),
+    FormField('disability_note', 'char', ('disability', ('var',))),
+
+    # Military (for males)
+    FormField('military_status', 'char', ('gender', ('erkek',))),
+    FormField('military_postpone_until', 'date', ('military_status', ('tecilli',))),
+
+    # Criminal record
+    FormField('criminal_record', 'char'),
+
+    # Family reunion
+    FormField('family_reunion', 'char'),
+    FormField('has_spouse', 'bool', ('family_reunion', ('evet',))),
+    FormField('children_count', 'int', ('family_reunion', ('evet',))),
+
+    # Spouse
+    FormField('spouse_name', 'char', SPOUSE),
+    FormField('spouse_birth_date', 'date', SPOUSE),
+    FormField('spouse_birth_place', 'char', SPOUSE),
+    FormField('spouse_phone', 'char', SPOUSE),
+    FormField('spouse_email', 'char', SPOUSE),
+    FormField('spouse_passport_has', 'char', SPOUSE),
+    FormField('spouse_passport_no', 'char', ('spouse_passport_has', ('evet',))),
+    FormField('spouse_passport_valid_until', 'date', ('spouse_passport_has', ('evet',))),
+    FormField('spouse_german_certificate', 'char', SPOUSE),
+
+    # Language
+    FormField('german_level', 'char'),
+    FormField('has_language_certificate', 'char'),
+    FormField('language_certificate_type', 'char', ('has_language_certificate', ('evet',))),
+
+    # Recognition
+    FormField('recognition_status', 'char'),
+    FormField('recognition_state', 'char', RECOGNITION),
+    FormField('recognition_applied_at', 'date', RECOGNITION),
+    FormField('recognition_received_at', 'date', RECOGNITION),
+
+    # Preferences
+    FormField('choice1', 'int'),
+    FormField('choice2', 'int'),
+    FormField('choice3', 'int'),
+    FormField('accept_other_department', 'bool'),
+
+    # Motivation
+    FormField('motivation_text', 'char'),
+    FormField('extra_info', 'char_or_false'),
+
+    # Consent
+    FormField('consent_ok', 'bool'),
+    FormField('consent_date', 'date'),
+    FormField('consent_name', 'char'),
+)
+
+APPLICATION_SECTIONS = (
+    FormSection('child', (
+        FormField('name', 'char'),
+        FormField('age', 'int'),
+        FormField('birth_date', 'date'),
+        FormField('birth_place', 'char'),
+        FormField('passport_has', 'char'),
+        FormField('passport_no', 'char', ('passport_has', ('evet',))),
+        FormField('passport_valid_until', 'date', ('passport_has', ('evet',))),
+    ), None, MAX_CHILDREN),
+    FormSection('experience', (
+        FormField('company', 'char'),
+        FormField('position', 'char'),
+        FormField('city', 'char'),
+        FormField('date_start', 'date'),
+        FormField('date_end', 'date'),
+        FormField('is_current', 'bool'),
+        FormField('duties', 'char'),
+        FormField('departments', 'ids'),
+        FormField('departments_other', 'char_or_false'),
+        FormField('devices', 'ids'),
+        FormField('devices_other', 'char_or_false'),
+    ), 'company', MAX_EXPERIENCES),
+    FormSection('education', (
+        FormField('school', 'char'),
+        FormField('city', 'char'),
+        FormField('date_start', 'date'),
+        FormField('date_end', 'date'),
+        FormField('is_current', 'bool'),
+    ), 'school', MAX_EDUCATIONS),
+)
+
+# Compiled once: section keys by name and the pattern of their posted keys
+_SECTIONS = {section.name: section for section in APPLICATION_SECTIONS}
+_SECTION_FIELDS = {section.name: {field.name for field in section.fields} for section in APPLICATION_SECTIONS}
+_SECTION_KEY = re.compile(r'^(%s)_([a-z_]+)_(\d{1,6})$' % '|'.join(map(re.escape, _SECTIONS)))
+
+
+def _decode_value(field, raw, values, errors, error_name):
+    """
+    Helper function returning the typed value of field from its posted raw
+    values, the list of the values of the key. An invalid value is reported
+    in errors and decoded as empty.
+    """
+    if field.gate:
+        gate_name, gate_values = field.gate
+        if values.get(gate_name) not in gate_values:
+            return 0 if field.kind == 'int' else False
+
+    if field.kind == 'ids':
+        return [int(val) for val in raw or () if val.isdigit()]
+
+    value = raw[0].strip() if raw else ''
+    if field.kind == 'char':
+        return value
+    if field.kind == 'char_or_false':
+        return value or False
+    if field.kind == 'bool':
+        return value == 'on'
+    if field.kind == 'int':
+        if not value:
+            return 0
+        if value.isdigit():
+            return int(value)
+        errors.append(([error_name], 'Geçersiz sayı değeri.'))
+        return 0
+    if field.kind == 'date':
+        if not value:
+            return False
+        try:
+            return fields.Date.to_date(value)
+        except ValueError:
+            errors.append(([error_name], 'Geçersiz tarih değeri.'))
+            return False
+    raise ValueError(f'Unknown form field kind {field.kind}')
+
+
+def decode_application_form(params):
+    """
+    Decode the posted application form in a single pass over its keys.
+
+    Only the section indexes actually posted are read, in their order, and
+    at most max_rows of them per section: a section with more rows is
+    reported instead of being walked.
+
+    :param params: the posted form, a werkzeug MultiDict
+    :return: (values, sections, errors) where values are the typed values of
+             APPLICATION_FIELDS, sections maps each section name to a list of
+             (index, row values) and errors is a list of (field names, message)
+    """
+    raw_values = {}
+    raw_rows = {name: {} for name in _SECTIONS}
+    overflow = set()
+    errors = []
+    for key, raw in params.lists():
+        match = _SECTION_KEY.match(key)
+        if not match:
+            raw_values[key] = raw
+            continue
+        name, field_name, index = match.group(1), match.group(2), int(match.group(3))
+        if field_name not in _SECTION_FIELDS[name]:
+            continue
+        rows = raw_rows[name]
+        if index not in rows:
+            if len(rows) >= _SECTIONS[name].max_rows:
+                overflow.add(name)
+                continue
+            rows[index] = {}
+        rows[index][field_name] = raw
+
+    values = {}
+    for field in APPLICATION_FIELDS:
+        values[field.name] = _decode_value(field, raw_values.get(field.name), values, errors, field.name)
+
+    sections = {}
+    for name, section in _SECTIONS.items():
+        if name in overflow:
+            errors.append(([f'{name}_ids'], f'En fazla {section.max_rows} kayıt girilebilir.'))
+        rows = []
+        for index in sorted(raw_rows[name]):
+            raw_row = raw_rows[name][index]
+            row = {}
+            for field in section.fields:
+                row[field.name] = _decode_value(
+                    field, raw_row.get(field.name), row, errors, f'{name}_{field.name}_{index}')
+            if section.required and not row[section.required]:
+                continue
+            rows.append((index, row))
+        sections[name] = rows
+    return values, sections, errors
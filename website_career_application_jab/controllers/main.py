@@ -1,17 +1,51 @@
 # -*- coding: utf-8 -*-
 # License LGPL-3
 
-import base64
+import hashlib
 import logging
-from odoo import http, _
+import re
+from odoo import http, _, Command
 from odoo.http import request
 from odoo.exceptions import ValidationError
+from odoo.tools.mimetypes import guess_mimetype
+from odoo.addons.website_career_application_jab.controllers.form_schema import MAX_CHILDREN, decode_application_form
+from odoo.addons.website_career_application_jab.models.ir_ui_view import CSRF_PLACEHOLDER
 
 _logger = logging.getLogger(__name__)
 
 # File size limit (10 MB in bytes)
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Bytes read from the start of a document to detect its type
+MAGIC_BYTES_SIZE = 4096
+
+# Browser cache lifetime of a versioned master data URL (1 year)
+MASTER_DATA_MAX_AGE = 365 * 24 * 60 * 60
+
+# Chunk size of the staged uploads (1 MB in bytes)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Document inputs of the form, stored in the application field <input>_id
+DOCUMENT_INPUTS = (
+    'passport_photo',
+    'disability_doc',
+    'military_postpone_doc',
+    'criminal_record_doc',
+    'spouse_passport_photo',
+    'language_certificate_doc',
+    'formul_a_b_doc',
+)
+
+# Request body limits, enforced from Content-Length before the body is read
+MAX_FORM_SIZE = 1024 * 1024
+MAX_SUBMIT_SIZE = MAX_FILE_SIZE * (len(DOCUMENT_INPUTS) + MAX_CHILDREN) + MAX_FORM_SIZE
+
+# Passport inputs of the children, added by the form JS
+CHILD_PASSPORT_INPUT = re.compile(r'^child_passport_photo_\d+$')
+
+# Application form template
+FORM_TEMPLATE = 'website_career_application_jab.career_application_form_template'
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {
     'pdf': ['application/pdf'],
@@ -32,412 +66,158 @@ class CareerApplicationController(http.Controller):
         """
         Display the career application form.
         """
-        # Get master data for form selections
-        departments = request.env['coflow.hospital.department'].sudo().search([
-            ('active', '=', True)
-        ], order='sequence, name')
-
-        devices = request.env['coflow.medical.device'].sudo().search([
-            ('active', '=', True)
-        ], order='sequence, name')
-
-        # Filter departments for job preferences (exclude "Diğer")
-        preference_departments = departments.filtered(lambda d: not d.is_other)
-
         values = {
-            'departments': departments,
-            'devices': devices,
-            'preference_departments': preference_departments,
+            **self._get_master_data_values(),
             'errors': {},
             'form_data': kwargs,  # In case of validation errors, repopulate form
         }
 
-        return request.render('website_career_application_jab.career_application_form_template', values)
+        # The empty form of anonymous visitors is served from the page cache
+        if not kwargs and not request.session.debug and request.env.user._is_public():
+            return self._render_cached_form(values)
 
-    @http.route('/kariyer/basvuru', type='http', auth='public', website=True, methods=['POST'], csrf=True)
+        return request.render(FORM_TEMPLATE, values)
+
+    @http.route('/kariyer/basvuru', type='http', auth='public', website=True, methods=['POST'], csrf=True,
+                max_content_length=MAX_SUBMIT_SIZE)
     def career_application_submit(self, **post):
         """
         Process the career application form submission.
         Validates all fields, handles file uploads, and creates the application record.
         """
         errors = {}
-        form_params = request.httprequest.form
         attachment_env = request.env['ir.attachment'].sudo()
         application_env = request.env['coflow.career.application'].sudo()
+        upload_env = request.env['coflow.career.application.upload'].sudo()
 
         try:
-            # ==================== COLLECT AND VALIDATE BASIC DATA ====================
-
-            # Personal information
-            full_name = post.get('full_name', '').strip()
-            gender = post.get('gender', '').strip()
-            birth_date = post.get('birth_date', '').strip()
-            birth_place = post.get('birth_place', '').strip()
-            birth_country = post.get('birth_country', '').strip()
-
-            # Address
-            addr_mahalle = post.get('addr_mahalle', '').strip()
-            addr_cadde = post.get('addr_cadde', '').strip()
-            addr_sokak = post.get('addr_sokak', '').strip()
-            addr_apt_no = post.get('addr_apt_no', '').strip()
-            addr_daire_no = post.get('addr_daire_no', '').strip()
-            addr_postcode = post.get('addr_postcode', '').strip()
-            addr_district = post.get('addr_district', '').strip()
-            addr_city = post.get('addr_city', '').strip()
-            addr_country = post.get('addr_country', '').strip()
-
-            # Contact
-            phone = post.get('phone', '').strip()
-            email = post.get('email', '').strip()
-            marital_status = post.get('marital_status', '').strip()
-
-            # Passport
-            passport_has = post.get('passport_has', '').strip()
-            passport_no = post.get('passport_no', '').strip() if passport_has == 'evet' else False
-            passport_valid_until = post.get('passport_valid_until', '').strip() if passport_has == 'evet' else False
-
-            # Disability
-            disability = post.get('disability', '').strip()
-            disability_note = post.get('disability_note', '').strip() if disability == 'var' else False
-
-            # Military (for males)
-            military_status = post.get('military_status', '').strip() if gender == 'erkek' else False
-            military_postpone_until = post.get('military_postpone_until', '').strip() if military_status == 'tecilli' else False
-
-            # Criminal record
-            criminal_record = post.get('criminal_record', '').strip()
-
-            # Family reunion
-            family_reunion = post.get('family_reunion', '').strip()
-            has_spouse = post.get('has_spouse') == 'on' if family_reunion == 'evet' else False
-            children_count = int(post.get('children_count', 0)) if family_reunion == 'evet' else 0
-
-            # Spouse information
-            spouse_name = post.get('spouse_name', '').strip() if has_spouse else False
-            spouse_birth_date = post.get('spouse_birth_date', '').strip() if has_spouse else False
-            spouse_birth_place = post.get('spouse_birth_place', '').strip() if has_spouse else False
-            spouse_phone = post.get('spouse_phone', '').strip() if has_spouse else False
-            spouse_email = post.get('spouse_email', '').strip() if has_spouse else False
-            spouse_passport_has = post.get('spouse_passport_has', '').strip() if has_spouse else False
-            spouse_passport_no = post.get('spouse_passport_no', '').strip() if spouse_passport_has == 'evet' else False
-            spouse_passport_valid_until = post.get('spouse_passport_valid_until', '').strip() if spouse_passport_has == 'evet' else False
-            spouse_german_certificate = post.get('spouse_german_certificate', '').strip() if has_spouse else False
-
-            # Language & Certificate
-            german_level = post.get('german_level', '').strip()
-            has_language_certificate = post.get('has_language_certificate', '').strip()
-            language_certificate_type = post.get('language_certificate_type', '').strip() if has_language_certificate == 'evet' else False
-
-            # Recognition
-            recognition_status = post.get('recognition_status', '').strip()
-            recognition_state = post.get('recognition_state', '').strip() if recognition_status in ('evet', 'devam-ediyor') else False
-            recognition_applied_at = post.get('recognition_applied_at', '').strip() if recognition_status in ('evet', 'devam-ediyor') else False
-            recognition_received_at = post.get('recognition_received_at', '').strip() if recognition_status in ('evet', 'devam-ediyor') else False
-
-            # Job preferences
-            choice1 = int(post.get('choice1', 0))
-            choice2 = int(post.get('choice2', 0))
-            choice3 = int(post.get('choice3', 0))
-            accept_other_department = post.get('accept_other_department') == 'on'
-
-            # Motivation & Extra
-            motivation_text = post.get('motivation_text', '').strip()
-            extra_info = post.get('extra_info', '').strip() or False
-
-            # Consent
-            consent_ok = post.get('consent_ok') == 'on'
-            consent_date = post.get('consent_date', '').strip()
-            consent_name = post.get('consent_name', '').strip()
+            # ==================== COLLECT BASIC DATA ====================
+
+            application_vals, sections, decode_errors = decode_application_form(request.httprequest.form)
+            if decode_errors:
+                for field_names, message in decode_errors:
+                    errors[field_names[0]] = message
+                errors['general'] = 'Formda geçersiz bir değer var, lütfen kontrol edin.'
+                return self._render_form_with_errors(errors, post)
 
             # ==================== FILE UPLOADS ====================
 
-            def process_file_upload(file_field_name, file_name_prefix):
-                """Helper function to process file uploads with validation"""
-                file_data = request.httprequest.files.get(file_field_name)
-                if not file_data or not file_data.filename:
-                    return False
+            # Check every posted document before any attachment is created
+            file_mimetypes = {}
+            for file_field_name, file_data in request.httprequest.files.items():
+                if not file_data.filename or post.get(f'{file_field_name}_token'):
+                    continue
 
-                # Check file size
+                # Get file size and first bytes
                 file_data.seek(0, 2)  # Seek to end
                 file_size = file_data.tell()
                 file_data.seek(0)  # Seek back to start
+                head = file_data.read(MAGIC_BYTES_SIZE)
+                file_data.seek(0)
 
-                if file_size > MAX_FILE_SIZE:
-                    errors[file_field_name] = f'Dosya boyutu çok büyük (maksimum 10MB). Yüklenen: {file_size / 1024 / 1024:.2f}MB'
-                    return False
+                error = self._check_file(file_data.filename.lower(), file_size, head)
+                if error:
+                    errors[file_field_name] = error
+                else:
+                    file_mimetypes[file_field_name] = guess_mimetype(head)
 
-                # Check file extension
-                filename = file_data.filename.lower()
-                extension = filename.rsplit('.', 1)[-1] if '.' in filename else ''
+            # If there are file upload errors, re-render form with errors
+            if errors:
+                return self._render_form_with_errors(errors, post)
 
-                if extension not in ALLOWED_EXTENSIONS:
-                    errors[file_field_name] = f'Geçersiz dosya uzantısı. İzin verilenler: PDF, JPG, PNG'
-                    return False
+            # Attachments by form input, scanned and previewed in the background
+            documents = {}
 
-                # Read file content
-                file_content = base64.b64encode(file_data.read())
+            def process_file_upload(file_field_name, file_name_prefix):
+                """Helper function to process file uploads with validation"""
+                # Document staged ahead of the submit
+                token = post.get(f'{file_field_name}_token')
+                if token:
+                    attachment = upload_env._claim(token, file_field_name, file_name_prefix)
+                    if not attachment:
+                        errors[file_field_name] = 'Yüklenen dosya bulunamadı, lütfen dosyayı tekrar seçin.'
+                        return False
+                    documents[file_field_name] = attachment
+                    return attachment.id
+
+                # Documents checked above
+                if file_field_name not in file_mimetypes:
+                    return False
+                file_data = request.httprequest.files[file_field_name]
 
-                # Create attachment
-                attachment = attachment_env.create({
-                    'name': f"{file_name_prefix}_{filename}",
-                    'datas': file_content,
-                    'mimetype': file_data.content_type,
+                # Stream the file content to the attachment
+                attachment = attachment_env._create_from_stream(file_data.stream, {
+                    'name': f"{file_name_prefix}_{file_data.filename.lower()}",
+                    'mimetype': file_mimetypes[file_field_name],
                     'res_model': 'coflow.career.application',
                 })
+                documents[file_field_name] = attachment
 
                 return attachment.id
 
             # Process all file uploads
-            passport_photo_id = process_file_upload('passport_photo', 'passport') if passport_has == 'evet' else False
-            disability_doc_id = process_file_upload('disability_doc', 'disability') if disability == 'var' else False
-            military_postpone_doc_id = process_file_upload('military_postpone_doc', 'military') if military_status == 'tecilli' else False
+            passport_photo_id = process_file_upload('passport_photo', 'passport') if application_vals['passport_has'] == 'evet' else False
+            disability_doc_id = process_file_upload('disability_doc', 'disability') if application_vals['disability'] == 'var' else False
+            military_postpone_doc_id = process_file_upload('military_postpone_doc', 'military') if application_vals['military_status'] == 'tecilli' else False
             criminal_record_doc_id = process_file_upload('criminal_record_doc', 'criminal_record')
-            spouse_passport_photo_id = process_file_upload('spouse_passport_photo', 'spouse_passport') if spouse_passport_has == 'evet' else False
-            language_certificate_doc_id = process_file_upload('language_certificate_doc', 'language_cert') if has_language_certificate == 'evet' else False
+            spouse_passport_photo_id = process_file_upload('spouse_passport_photo', 'spouse_passport') if application_vals['spouse_passport_has'] == 'evet' else False
+            language_certificate_doc_id = process_file_upload('language_certificate_doc', 'language_cert') if application_vals['has_language_certificate'] == 'evet' else False
             formul_a_b_doc_id = process_file_upload('formul_a_b_doc', 'formul_ab') or False
 
-            # If there are file upload errors, re-render form with errors
+            # ==================== PREPARE CHILDREN VALUES ====================
+
+            # Child rows are created together with the application so that
+            # _check_children_records only ever sees the complete dossier.
+            child_commands = []
+            for i, child_vals in self._get_child_rows(application_vals, sections):
+                # Process child passport photo
+                if child_vals['passport_has'] == 'evet':
+                    child_vals['passport_photo_id'] = process_file_upload(f'child_passport_photo_{i}', f'child_{i}_passport')
+                child_commands.append(Command.create(child_vals))
+
+            # If there are file upload errors, re-render form with errors.
+            # The uploads claimed so far are released for the next submit.
             if errors:
+                request.env.cr.rollback()
                 return self._render_form_with_errors(errors, post)
 
+            # ==================== PREPARE EXPERIENCE VALUES ====================
+
+            experience_commands = []
+            for i, experience_vals in sections['experience']:
+                experience_vals['department_ids'] = [Command.set(experience_vals.pop('departments'))]
+                experience_vals['device_ids'] = [Command.set(experience_vals.pop('devices'))]
+                experience_commands.append(Command.create(experience_vals))
+
+            # ==================== PREPARE EDUCATION VALUES ====================
+
+            education_commands = [Command.create(education_vals) for i, education_vals in sections['education']]
+
             # ==================== PREPARE APPLICATION VALUES ====================
 
-            application_vals = {
-                # Personal
-                'full_name': full_name,
-                'gender': gender,
-                'birth_date': birth_date,
-                'birth_place': birth_place,
-                'birth_country': birth_country,
-                'marital_status': marital_status,
-
-                # Address
-                'addr_mahalle': addr_mahalle,
-                'addr_cadde': addr_cadde,
-                'addr_sokak': addr_sokak,
-                'addr_apt_no': addr_apt_no,
-                'addr_daire_no': addr_daire_no,
-                'addr_postcode': addr_postcode,
-                'addr_district': addr_district,
-                'addr_city': addr_city,
-                'addr_country': addr_country,
-
-                # Contact
-                'phone': phone,
-                'email': email,
-
-                # Passport
-                'passport_has': passport_has,
-                'passport_no': passport_no,
-                'passport_valid_until': passport_valid_until,
+            application_vals.update({
                 'passport_photo_id': passport_photo_id,
-
-                # Disability
-                'disability': disability,
-                'disability_note': disability_note,
                 'disability_doc_id': disability_doc_id,
-
-                # Military
-                'military_status': military_status,
-                'military_postpone_until': military_postpone_until,
                 'military_postpone_doc_id': military_postpone_doc_id,
-
-                # Criminal record
-                'criminal_record': criminal_record,
                 'criminal_record_doc_id': criminal_record_doc_id,
-
-                # Family reunion
-                'family_reunion': family_reunion,
-                'has_spouse': has_spouse,
-                'children_count': children_count,
-
-                # Spouse
-                'spouse_name': spouse_name,
-                'spouse_birth_date': spouse_birth_date,
-                'spouse_birth_place': spouse_birth_place,
-                'spouse_phone': spouse_phone,
-                'spouse_email': spouse_email,
-                'spouse_passport_has': spouse_passport_has,
-                'spouse_passport_no': spouse_passport_no,
-                'spouse_passport_valid_until': spouse_passport_valid_until,
                 'spouse_passport_photo_id': spouse_passport_photo_id,
-                'spouse_german_certificate': spouse_german_certificate,
-
-                # Language
-                'german_level': german_level,
-                'has_language_certificate': has_language_certificate,
-                'language_certificate_type': language_certificate_type,
                 'language_certificate_doc_id': language_certificate_doc_id,
-
-                # Recognition
-                'recognition_status': recognition_status,
-                'recognition_state': recognition_state,
-                'recognition_applied_at': recognition_applied_at,
-                'recognition_received_at': recognition_received_at,
-
-                # Preferences
-                'choice1': choice1,
-                'choice2': choice2,
-                'choice3': choice3,
-                'accept_other_department': accept_other_department,
-
-                # Motivation
-                'motivation_text': motivation_text,
-                'extra_info': extra_info,
-
-                # Documents
                 'formul_a_b_doc_id': formul_a_b_doc_id,
-
-                # Consent
-                'consent_ok': consent_ok,
-                'consent_date': consent_date,
-                'consent_name': consent_name,
-
-                # State
+                'child_ids': child_commands,
+                'experience_ids': experience_commands,
+                'education_ids': education_commands,
                 'state': 'submitted',
-            }
+            })
 
             # ==================== CREATE APPLICATION ====================
 
-            application = application_env.create(application_vals)
-
-            # ==================== CREATE CHILDREN RECORDS ====================
-
-            if family_reunion == 'evet' and children_count > 0:
-                child_env = request.env['coflow.career.application.child'].sudo()
-                for i in range(1, children_count + 1):
-                    child_name = post.get(f'child_name_{i}', '').strip()
-                    child_age = int(post.get(f'child_age_{i}', 0))
-                    child_birth_date = post.get(f'child_birth_date_{i}', '').strip()
-                    child_birth_place = post.get(f'child_birth_place_{i}', '').strip()
-                    child_passport_has = post.get(f'child_passport_has_{i}', '').strip()
-                    child_passport_no = post.get(f'child_passport_no_{i}', '').strip() if child_passport_has == 'evet' else False
-                    child_passport_valid_until = post.get(f'child_passport_valid_until_{i}', '').strip() if child_passport_has == 'evet' else False
-
-                    # Process child passport photo
-                    child_passport_photo_id = process_file_upload(f'child_passport_photo_{i}', f'child_{i}_passport') if child_passport_has == 'evet' else False
-
-                    child_vals = {
-                        'application_id': application.id,
-                        'name': child_name,
-                        'age': child_age,
-                        'birth_date': child_birth_date,
-                        'birth_place': child_birth_place,
-                        'passport_has': child_passport_has,
-                        'passport_no': child_passport_no,
-                        'passport_valid_until': child_passport_valid_until,
-                        'passport_photo_id': child_passport_photo_id,
-                    }
-
-                    child_env.create(child_vals)
-
-            # ==================== CREATE EXPERIENCE RECORDS ====================
-
-            # Count experience entries
-            experience_count = 0
-            for key in post.keys():
-                if key.startswith('experience_company_'):
-                    idx = key.replace('experience_company_', '')
-                    if idx.isdigit():
-                        experience_count = max(experience_count, int(idx))
-
-            if experience_count > 0:
-                experience_env = request.env['coflow.career.application.experience'].sudo()
-                for i in range(1, experience_count + 1):
-                    company = post.get(f'experience_company_{i}', '').strip()
-                    if not company:  # Skip empty entries
-                        continue
-
-                    position = post.get(f'experience_position_{i}', '').strip()
-                    city = post.get(f'experience_city_{i}', '').strip()
-                    date_start = post.get(f'experience_date_start_{i}', '').strip()
-                    date_end = post.get(f'experience_date_end_{i}', '').strip() or False
-                    is_current = post.get(f'experience_is_current_{i}') == 'on'
-                    duties = post.get(f'experience_duties_{i}', '').strip()
-
-                    # Get selected departments (many2many)
-                    department_ids = []
-                    dept_field = f'experience_departments_{i}'
-                    dept_values = []
-                    if hasattr(form_params, 'getlist'):
-                        dept_values = [val for val in form_params.getlist(dept_field) if val]
-                    if not dept_values:
-                        dept_raw = post.get(dept_field)
-                        if isinstance(dept_raw, (list, tuple, set)):
-                            dept_values = [val for val in dept_raw if val]
-                        elif dept_raw:
-                            dept_values = [dept_raw]
-                    if dept_values:
-                        department_ids = [int(str(val)) for val in dept_values if str(val).isdigit()]
-
-                    departments_other = post.get(f'experience_departments_other_{i}', '').strip() or False
-
-                    # Get selected devices (many2many)
-                    device_ids = []
-                    device_field = f'experience_devices_{i}'
-                    device_values = []
-                    if hasattr(form_params, 'getlist'):
-                        device_values = [val for val in form_params.getlist(device_field) if val]
-                    if not device_values:
-                        device_raw = post.get(device_field)
-                        if isinstance(device_raw, (list, tuple, set)):
-                            device_values = [val for val in device_raw if val]
-                        elif device_raw:
-                            device_values = [device_raw]
-                    if device_values:
-                        device_ids = [int(str(val)) for val in device_values if str(val).isdigit()]
-
-                    devices_other = post.get(f'experience_devices_other_{i}', '').strip() or False
-
-                    experience_vals = {
-                        'application_id': application.id,
-                        'company': company,
-                        'position': position,
-                        'city': city,
-                        'date_start': date_start,
-                        'date_end': date_end,
-                        'is_current': is_current,
-                        'duties': duties,
-                        'department_ids': [(6, 0, department_ids)],
-                        'departments_other': departments_other,
-                        'device_ids': [(6, 0, device_ids)],
-                        'devices_other': devices_other,
-                    }
-
-                    experience_env.create(experience_vals)
-
-            # ==================== CREATE EDUCATION RECORDS ====================
-
-            # Count education entries
-            education_count = 0
-            for key in post.keys():
-                if key.startswith('education_school_'):
-                    idx = key.replace('education_school_', '')
-                    if idx.isdigit():
-                        education_count = max(education_count, int(idx))
-
-            if education_count > 0:
-                education_env = request.env['coflow.career.application.education'].sudo()
-                for i in range(1, education_count + 1):
-                    school = post.get(f'education_school_{i}', '').strip()
-                    if not school:  # Skip empty entries
-                        continue
-
-                    city = post.get(f'education_city_{i}', '').strip()
-                    date_start = post.get(f'education_date_start_{i}', '').strip()
-                    date_end = post.get(f'education_date_end_{i}', '').strip() or False
-                    is_current = post.get(f'education_is_current_{i}') == 'on'
-
-                    education_vals = {
-                        'application_id': application.id,
-                        'school': school,
-                        'city': city,
-                        'date_start': date_start,
-                        'date_end': date_end,
-                        'is_current': is_current,
-                    }
-
-                    education_env.create(education_vals)
+            # One create for the whole dossier: the ORM batches the one2many
+            # rows per model and the many2many relation rows in bulk. Field
+            # tracking is skipped, a single message logs the submit.
+            application = application_env._create_from_website(application_vals)
+
+            # Scans, previews and the confirmation e-mail run in the cron workers
+            request.env['coflow.career.application.job'].sudo()._enqueue_application(application, documents)
 
             # ==================== REDIRECT TO THANK YOU PAGE ====================
 
@@ -445,35 +225,197 @@ class CareerApplicationController(http.Controller):
 
         except ValidationError as e:
             _logger.error(f"Validation error in career application: {e}")
+            # Drop the partial application and release the claimed uploads
+            request.env.cr.rollback()
             errors['general'] = str(e)
             return self._render_form_with_errors(errors, post)
 
         except Exception as e:
             _logger.exception(f"Error creating career application: {e}")
+            request.env.cr.rollback()
             errors['general'] = 'Başvuru sırasında bir hata oluştu. Lütfen tekrar deneyin.'
             return self._render_form_with_errors(errors, post)
 
-    def _render_form_with_errors(self, errors, form_data):
-        """Helper method to re-render the form with errors"""
-        departments = request.env['coflow.hospital.department'].sudo().search([
-            ('active', '=', True)
-        ], order='sequence, name')
+    def _check_file(self, filename, file_size, head=None):
+        """
+        Helper method returning the error message of an invalid document, if
+        any. When its first bytes head are given, the type detected from
+        their magic bytes must match the extension.
+        """
+        if file_size > MAX_FILE_SIZE:
+            return f'Dosya boyutu çok büyük (maksimum 10MB). Yüklenen: {file_size / 1024 / 1024:.2f}MB'
+        extension = filename.rsplit('.', 1)[-1] if '.' in filename else ''
+        if extension not in ALLOWED_EXTENSIONS:
+            return 'Geçersiz dosya uzantısı. İzin verilenler: PDF, JPG, PNG'
+        if head is not None and guess_mimetype(head) not in ALLOWED_EXTENSIONS[extension]:
+            return 'Dosya içeriği uzantısıyla uyuşmuyor. İzin verilenler: PDF, JPG, PNG'
+        return False
+
+    def _get_child_rows(self, vals, sections):
+        """
+        Helper method returning the decoded (index, values) rows of the
+        children announced by the children_count of the application.
+        """
+        if vals['family_reunion'] != 'evet':
+            return []
+        return [(index, row) for index, row in sections['child'] if index <= vals['children_count']]
+
+    def _get_master_data_values(self):
+        """Helper method returning the cached master data for form selections"""
+        departments = request.env['coflow.hospital.department']._get_form_options()
+        return {
+            'departments': departments,
+            'devices': request.env['coflow.medical.device']._get_form_options(),
+            # Departments for job preferences (exclude "Diğer")
+            'preference_departments': tuple(d for d in departments if not d.is_other),
+            'validate_url': request.env['ir.http']._url_for('/kariyer/basvuru/dogrula'),
+            'upload_url': '/kariyer/basvuru/yukleme',
+            # Experience selections are filled by the form JS from this URL
+            'master_data_url': request.env['ir.http']._url_for(
+                f'/kariyer/basvuru/veriler?v={self._get_master_data_version()}'),
+        }
 
-        devices = request.env['coflow.medical.device'].sudo().search([
-            ('active', '=', True)
-        ], order='sequence, name')
+    def _get_master_data_version(self):
+        """Helper method returning a hash of the cached master data"""
+        master_data = (
+            request.env['coflow.hospital.department']._get_form_options(),
+            request.env['coflow.medical.device']._get_form_options(),
+        )
+        return hashlib.sha1(repr(master_data).encode()).hexdigest()[:16]
 
-        preference_departments = departments.filtered(lambda d: not d.is_other)
+    def _render_cached_form(self, values):
+        """
+        Helper method serving the empty form from the page cache, with the
+        CSRF token of the request filled in. The ETag covers the page and
+        the session: browsers revalidate it and get a 304 while both are
+        unchanged, keeping the token of their cached copy, which is only
+        valid for the session it was issued in.
+        """
+        html, page_hash, rendered_at = request.env['ir.ui.view'].sudo()._render_career_form_page(
+            FORM_TEMPLATE, request.website.id, request.env.lang,
+            self._get_master_data_version(), values)
+        response = request.make_response(html.replace(CSRF_PLACEHOLDER, request.csrf_token()))
+        session_hash = hashlib.sha1(request.session.sid.encode()).hexdigest()[:16]
+        response.set_etag(f'{page_hash}-{session_hash}')
+        response.last_modified = rendered_at
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request.httprequest)
 
+    def _render_form_with_errors(self, errors, form_data):
+        """Helper method to re-render the form with errors"""
         values = {
-            'departments': departments,
-            'devices': devices,
-            'preference_departments': preference_departments,
+            **self._get_master_data_values(),
             'errors': errors,
             'form_data': form_data,
         }
 
-        return request.render('website_career_application_jab.career_application_form_template', values)
+        return request.render(FORM_TEMPLATE, values)
+
+    @http.route('/kariyer/basvuru/dogrula', type='http', auth='public', website=True, methods=['POST'], csrf=True, sitemap=False,
+                max_content_length=MAX_FORM_SIZE)
+    def career_application_validate(self, **post):
+        """
+        Validate the form against the application constraints before the
+        final submit, so that the documents are only uploaded once. The form
+        is posted without its files, 'files' lists the document inputs that
+        have a file selected.
+        """
+        selected_files = set(request.httprequest.form.getlist('files'))
+        attachment_env = request.env['ir.attachment'].sudo()
+        vals, sections, errors = decode_application_form(request.httprequest.form)
+        for input_name in DOCUMENT_INPUTS:
+            if input_name in selected_files:
+                vals[f'{input_name}_id'] = attachment_env.new({'name': input_name})
+        vals['child_ids'] = [Command.create(row) for index, row in self._get_child_rows(vals, sections)]
+        errors += request.env['coflow.career.application'].sudo()._get_validation_errors(vals)
+
+        # Documents and children are reported on their form inputs
+        form_names = {f'{input_name}_id': input_name for input_name in DOCUMENT_INPUTS}
+        form_names['child_ids'] = 'children_count'
+        return request.make_json_response({
+            'valid': not errors,
+            'errors': [{
+                'fields': [form_names.get(name, name) for name in field_names],
+                'message': message,
+            } for field_names, message in errors],
+        })
+
+    @http.route('/kariyer/basvuru/yukleme', type='http', auth='public', methods=['POST'], csrf=True,
+                max_content_length=MAX_FORM_SIZE)
+    def career_application_upload_start(self, input_name='', filename='', size='0', mimetype='', **kwargs):
+        """
+        Start a staged upload of a document of the form. Return the token
+        the chunks are sent to and the final submit references, and the
+        chunk size.
+        """
+        size = int(size) if size.isdigit() else 0
+        error = self._check_file(filename.lower(), size)
+        if not size or not (input_name in DOCUMENT_INPUTS or CHILD_PASSPORT_INPUT.match(input_name)):
+            error = 'Geçersiz dosya.'
+        if error:
+            return request.make_json_response({'error': error}, status=400)
+        upload = request.env['coflow.career.application.upload'].sudo().create({
+            'input_name': input_name,
+            'filename': filename,
+            'size': size,
+            'mimetype': mimetype,
+        })
+        return request.make_json_response({'token': upload.token, 'chunk_size': UPLOAD_CHUNK_SIZE})
+
+    @http.route('/kariyer/basvuru/yukleme/<string:token>', type='http', auth='public', methods=['GET', 'POST'], csrf=True,
+                max_content_length=UPLOAD_CHUNK_SIZE)
+    def career_application_upload_chunk(self, token, offset='0', **kwargs):
+        """
+        POST: write the request body as the chunk of the upload at offset.
+        GET: return the progress of the upload, to resume it.
+        A chunk is refused with a 409 unless it starts at the received size,
+        the first one with a 415 if it is not a PDF, JPEG or PNG document.
+        """
+        upload = request.env['coflow.career.application.upload'].sudo().search([('token', '=', token)], limit=1)
+        if not upload:
+            return request.make_json_response({'error': 'Yükleme bulunamadı.'}, status=404)
+        status = 200
+        if request.httprequest.method == 'POST':
+            data = request.httprequest.get_data(cache=False)
+            offset = int(offset) if offset.isdigit() else -1
+            if offset == 0:
+                # The type of the document is checked on its first bytes
+                head = data[:MAGIC_BYTES_SIZE]
+                error = self._check_file(upload.filename.lower(), upload.size, head)
+                if error:
+                    return request.make_json_response({'error': error}, status=415)
+                upload.mimetype = guess_mimetype(head)
+            if not upload._write_chunk(offset, data):
+                status = 409
+        return request.make_json_response({
+            'received': upload.received,
+            'size': upload.size,
+            'done': upload.state != 'uploading',
+        }, status=status)
+
+    @http.route('/kariyer/basvuru/veriler', type='http', auth='public', website=True, methods=['GET'], sitemap=False)
+    def career_application_master_data(self, v=None, **kwargs):
+        """
+        Departments and devices of the experience selections as JSON,
+        versioned by a hash of their content. Requested with the current
+        version the response is cached for a year, otherwise browsers
+        revalidate it with its ETag.
+        """
+        version = self._get_master_data_version()
+        response = request.make_json_response({
+            'version': version,
+            'departments': [(dept.id, dept.name) for dept in
+                            request.env['coflow.hospital.department']._get_form_options()],
+            'devices': [(device.id, device.name) for device in
+                        request.env['coflow.medical.device']._get_form_options()],
+        })
+        response.set_etag(version)
+        if v == version:
+            response.headers['Cache-Control'] = f'public, max-age={MASTER_DATA_MAX_AGE}, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, no-cache'
+        return response.make_conditional(request.httprequest)
 
     @http.route('/kariyer/tesekkurler', type='http', auth='public', website=True)
     def career_application_thank_you(self, **kwargs):
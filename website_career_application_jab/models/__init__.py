@@ -6,3 +6,9 @@ from . import child
 from . import job_experience
 from . import job_education
 from . import job_application
+from . import application_upload
+from . import application_job
+from . import ir_attachment
+from . import ir_http
+from . import document_dedup_report
+from . import ir_ui_view
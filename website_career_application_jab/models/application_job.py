@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import logging
+import socket
+import struct
+from datetime import timedelta
+from functools import partial
+
+from odoo import models, fields, api, _
+
+_logger = logging.getLogger(__name__)
+
+# Attempts of a job before it is marked as failed, the delay before a
+# retry doubles after each attempt starting from JOB_RETRY_DELAY seconds
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 60
+
+# Jobs run by one cron worker call before it triggers itself again
+JOB_BATCH_SIZE = 50
+
+# Bytes sent at a time to clamd and seconds to wait for its answer
+CLAMD_CHUNK_SIZE = 64 * 1024
+CLAMD_TIMEOUT = 30
+
+JOB_TYPE_SELECTION = [
+    ('scan', 'Virüs Taraması'),
+    ('preview', 'Önizleme'),
+    ('confirmation_mail', 'Onay E-postası'),
+]
+
+JOB_STATE_SELECTION = [
+    ('pending', 'Bekliyor'),
+    ('done', 'Tamamlandı'),
+    ('failed', 'Başarısız'),
+]
+
+
+class CareerApplicationJob(models.Model):
+    """
+    Follow-up work of a submitted application, run by the cron workers
+    instead of the public submit request: the virus scan and the preview of
+    every document, then the confirmation e-mail of the applicant.
+
+    Workers claim pending jobs with SELECT ... FOR UPDATE SKIP LOCKED, so
+    several of them run side by side without taking the same job; the
+    concurrency is the number of active worker crons. A failed job is
+    retried with an exponential backoff up to JOB_MAX_ATTEMPTS times.
+    """
+    _name = 'coflow.career.application.job'
+    _description = 'Career Application - Background Job'
+    _order = 'id desc'
+
+    application_id = fields.Many2one(
+        'coflow.career.application',
+        string='Başvuru',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    attachment_id = fields.Many2one(
+        'ir.attachment',
+        string='Belge',
+        ondelete='cascade',
+        help='Document the job processes'
+    )
+    input_name = fields.Char(
+        string='Form Input',
+        help='Name of the file input of the form the document was uploaded in'
+    )
+    job_type = fields.Selection(
+        JOB_TYPE_SELECTION,
+        string='İş',
+        required=True
+    )
+    state = fields.Selection(
+        JOB_STATE_SELECTION,
+        string='Durum',
+        required=True,
+        default='pending',
+        index=True
+    )
+    eta = fields.Datetime(
+        string='Çalışma Zamanı',
+        required=True,
+        default=fields.Datetime.now,
+        help='The job is not run before this time'
+    )
+    attempts = fields.Integer(
+        string='Deneme',
+        readonly=True
+    )
+    last_error = fields.Text(
+        string='Son Hata',
+        readonly=True
+    )
+    date_done = fields.Datetime(
+        string='Tamamlanma',
+        readonly=True
+    )
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS coflow_career_application_job_pending_idx
+                ON coflow_career_application_job (eta, id)
+             WHERE state = 'pending'
+        """)
+
+    @api.model
+    def _enqueue_application(self, application, documents):
+        """
+        Queue the follow-up jobs of the submitted application: the scan of
+        each of documents, a dict of the attachments by form input, and the
+        confirmation e-mail. The previews are queued by the scans.
+        """
+        vals_list = [{
+            'application_id': application.id,
+            'attachment_id': attachment.id,
+            'input_name': input_name,
+            'job_type': 'scan',
+        } for input_name, attachment in documents.items() if attachment]
+        if application.email:
+            vals_list.append({
+                'application_id': application.id,
+                'job_type': 'confirmation_mail',
+            })
+        jobs = self.create(vals_list)
+        self.env.ref('website_career_application_jab.ir_cron_career_application_jobs')._trigger()
+        return jobs
+
+    @api.model
+    def _cron_run_jobs(self, batch_size=None, auto_commit=False):
+        """
+        Run the pending jobs that are due, one at a time and at most
+        batch_size of them (the website_career_application_jab.job_batch_size
+        parameter by default). The row of a job stays locked until it is
+        committed, so with auto_commit several workers can run concurrently.
+        """
+        if batch_size is None:
+            batch_size = int(self.env['ir.config_parameter'].sudo().get_param(
+                'website_career_application_jab.job_batch_size', JOB_BATCH_SIZE))
+        for __ in range(batch_size):
+            self.env.cr.execute("""
+                SELECT id FROM coflow_career_application_job
+                 WHERE state = 'pending' AND eta <= (now() at time zone 'UTC')
+                 ORDER BY eta, id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """)
+            row = self.env.cr.fetchone()
+            if not row:
+                return
+            self.browse(row[0])._run()
+            if auto_commit:
+                self.env.cr.commit()
+        # More jobs may be due, run them in a new call
+        self.env.ref('website_career_application_jab.ir_cron_career_application_jobs')._trigger()
+
+    def _run(self):
+        """Run the job, and schedule its retry if it fails"""
+        self.ensure_one()
+        attempts = self.attempts + 1
+        try:
+            with self.env.cr.savepoint():
+                getattr(self, f'_run_{self.job_type}')()
+        except Exception as e:
+            _logger.warning("Career application job %s (%s) failed: %s", self.id, self.job_type, e)
+            self.write({
+                'attempts': attempts,
+                'last_error': str(e),
+                'state': 'failed' if attempts >= JOB_MAX_ATTEMPTS else 'pending',
+                'eta': fields.Datetime.now() + timedelta(seconds=JOB_RETRY_DELAY * 2 ** (attempts - 1)),
+            })
+        else:
+            self.write({
+                'attempts': attempts,
+                'state': 'done',
+                'date_done': fields.Datetime.now(),
+            })
+
+    def action_retry(self):
+        """Queue the failed jobs again"""
+        self.filtered(lambda job: job.state == 'failed').write({
+            'state': 'pending',
+            'attempts': 0,
+            'eta': fields.Datetime.now(),
+        })
+        self.env.ref('website_career_application_jab.ir_cron_career_application_jobs')._trigger()
+
+    # ==================== JOBS ====================
+
+    def _run_scan(self):
+        """
+        Scan the document with the clamd daemon of the
+        website_career_application_jab.clamd_address parameter, 'host:port'
+        or the path of its unix socket. Clean documents get their preview,
+        scanning is skipped when no daemon is configured.
+        """
+        attachment = self.attachment_id
+        address = self.env['ir.config_parameter'].sudo().get_param('website_career_application_jab.clamd_address')
+        if address:
+            if attachment.store_fname:
+                with open(attachment._full_path(attachment.store_fname), 'rb') as stream:
+                    reply = self._clamd_instream(address, stream)
+            else:
+                reply = self._clamd_instream(address, [attachment.raw or b''])
+            if reply.endswith('FOUND'):
+                signature = reply.split(':', 1)[-1][:-len('FOUND')].strip()
+                attachment.career_scan_state = 'infected'
+                self.application_id._message_log(
+                    body=_('Belgede virüs bulundu: %(name)s (%(signature)s)',
+                           name=attachment.name, signature=signature))
+                return
+            if not reply.endswith('OK'):
+                raise OSError(f'clamd: {reply}')
+            attachment.career_scan_state = 'clean'
+        self.create({
+            'application_id': self.application_id.id,
+            'attachment_id': attachment.id,
+            'input_name': self.input_name,
+            'job_type': 'preview',
+        })
+
+    @api.model
+    def _clamd_instream(self, address, stream):
+        """
+        Helper method sending the content of stream, a file object or a list
+        of bytes, to clamd with the INSTREAM command and returning its reply
+        """
+        if ':' in address:
+            host, port = address.rsplit(':', 1)
+            sock = socket.create_connection((host, int(port)), timeout=CLAMD_TIMEOUT)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CLAMD_TIMEOUT)
+            sock.connect(address)
+        with sock:
+            sock.sendall(b'zINSTREAM\0')
+            chunks = stream if isinstance(stream, list) else iter(partial(stream.read, CLAMD_CHUNK_SIZE), b'')
+            for chunk in chunks:
+                sock.sendall(struct.pack('!L', len(chunk)) + chunk)
+            sock.sendall(struct.pack('!L', 0))
+            reply = b''
+            while not reply.endswith(b'\0'):
+                data = sock.recv(4096)
+                if not data:
+                    break
+                reply += data
+        return reply.rstrip(b'\0').decode(errors='replace').strip()
+
+    def _run_preview(self):
+        """Normalize the document and make its preview thumbnail"""
+        self.attachment_id._normalize_career_document(self.input_name)
+
+    def _run_confirmation_mail(self):
+        """Queue the confirmation e-mail of the applicant"""
+        template = self.env.ref('website_career_application_jab.mail_template_career_application_received')
+        template.send_mail(self.application_id.id)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import re
+from collections import namedtuple
+
+# Patterns of the contact fields, compiled once
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_RE = re.compile(r'^[\d\s\+\-\(\)]+$')
+PHONE_SEPARATORS_RE = re.compile(r'[\s\+\-\(\)]')
+
+MIN_PHONE_DIGITS = 10
+MIN_AGE = 18
+# Children of an application, also the rows of the child section of the form
+MAX_CHILDREN = 2
+
+# A validation rule of coflow.career.application.
+#   fields: the fields a violation is reported on
+#   violated: function(record, today) returning True when the record breaks the rule
+#   message: the error message, or a function(record) returning it
+#   depends: other fields read by the rule
+ApplicationRule = namedtuple('ApplicationRule', ['fields', 'violated', 'message', 'depends'], defaults=[()])
+
+
+def _required_if(gate_name, gate_values, field_name, message):
+    """
+    Helper function building the rule of a field required when the gate field
+    has one of gate_values
+    """
+    return ApplicationRule(
+        (field_name,),
+        lambda rec, today: rec[gate_name] in gate_values and not rec[field_name],
+        message,
+        (gate_name,),
+    )
+
+
+def _is_phone(value):
+    """Helper function telling whether a phone number has a valid format"""
+    return bool(PHONE_RE.match(value))
+
+
+def _is_spouse_required(rec):
+    """Helper function telling whether the spouse information is required"""
+    return rec.family_reunion == 'evet' and rec.has_spouse
+
+
+def _spouse_required(field_name, message):
+    """Helper function building the rule of a field required with a spouse"""
+    return ApplicationRule(
+        (field_name,),
+        lambda rec, today: _is_spouse_required(rec) and not rec[field_name],
+        message,
+        ('family_reunion', 'has_spouse'),
+    )
+
+
+RECOGNITION_DONE = ('evet', 'devam-ediyor')
+
+APPLICATION_RULES = (
+    # Contact
+    ApplicationRule(
+        ('email',),
+        lambda rec, today: rec.email and not EMAIL_RE.match(rec.email),
+        'Geçersiz e-posta adresi formatı!'),
+    ApplicationRule(
+        ('phone',),
+        lambda rec, today: rec.phone and not _is_phone(rec.phone),
+        'Geçersiz telefon numarası formatı!'),
+    ApplicationRule(
+        ('phone',),
+        lambda rec, today: (rec.phone and _is_phone(rec.phone)
+                            and len(PHONE_SEPARATORS_RE.sub('', rec.phone)) < MIN_PHONE_DIGITS),
+        f'Telefon numarası en az {MIN_PHONE_DIGITS} rakam içermelidir!'),
+    ApplicationRule(
+        ('spouse_email',),
+        lambda rec, today: rec.spouse_email and not EMAIL_RE.match(rec.spouse_email),
+        'Geçersiz eş e-posta adresi formatı!'),
+    ApplicationRule(
+        ('spouse_phone',),
+        lambda rec, today: rec.spouse_phone and not _is_phone(rec.spouse_phone),
+        'Geçersiz eş telefon numarası formatı!'),
+
+    # Birth date
+    ApplicationRule(
+        ('birth_date',),
+        lambda rec, today: rec.birth_date and rec.birth_date >= today,
+        'Doğum tarihi bugünden önce olmalıdır!'),
+    ApplicationRule(
+        ('birth_date',),
+        lambda rec, today: rec.birth_date and rec.birth_date < today and (today - rec.birth_date).days / 365.25 < MIN_AGE,
+        f'Başvuru sahibi en az {MIN_AGE} yaşında olmalıdır!'),
+
+    # Military
+    _required_if('gender', ('erkek',), 'military_status',
+                 'Erkek başvuru sahipleri için askerlik durumu zorunludur!'),
+    _required_if('military_status', ('tecilli',), 'military_postpone_until',
+                 'Tecilli askerlik için tecil bitiş tarihi zorunludur!'),
+    _required_if('military_status', ('tecilli',), 'military_postpone_doc_id',
+                 'Tecilli askerlik için tecil belgesi zorunludur!'),
+
+    # Passport
+    _required_if('passport_has', ('evet',), 'passport_no',
+                 'Pasaport var olarak işaretlendi, pasaport numarası zorunludur!'),
+    _required_if('passport_has', ('evet',), 'passport_valid_until',
+                 'Pasaport var olarak işaretlendi, geçerlilik tarihi zorunludur!'),
+    _required_if('passport_has', ('evet',), 'passport_photo_id',
+                 'Pasaport var olarak işaretlendi, pasaport fotoğrafı zorunludur!'),
+    ApplicationRule(
+        ('passport_valid_until',),
+        lambda rec, today: rec.passport_valid_until and rec.passport_valid_until < today,
+        'Pasaport geçerlilik tarihi geçmiş olamaz!'),
+
+    # Disability
+    _required_if('disability', ('var',), 'disability_note',
+                 'Engellilik var olarak işaretlendi, açıklama zorunludur!'),
+    _required_if('disability', ('var',), 'disability_doc_id',
+                 'Engellilik var olarak işaretlendi, belge zorunludur!'),
+
+    # Criminal record
+    ApplicationRule(
+        ('criminal_record_doc_id',),
+        lambda rec, today: rec.criminal_record and not rec.criminal_record_doc_id,
+        'Adli sicil belgesi zorunludur!',
+        ('criminal_record',)),
+
+    # Children
+    ApplicationRule(
+        ('children_count',),
+        lambda rec, today: rec.family_reunion == 'evet' and not 0 <= rec.children_count <= MAX_CHILDREN,
+        f'Çocuk sayısı 0-{MAX_CHILDREN} arasında olmalıdır!',
+        ('family_reunion',)),
+    ApplicationRule(
+        ('child_ids',),
+        lambda rec, today: rec.family_reunion == 'evet' and len(rec.child_ids) != rec.children_count,
+        lambda rec: (f'Çocuk sayısı {rec.children_count} olarak belirtildi, '
+                     f'ancak {len(rec.child_ids)} çocuk kaydı var!'),
+        ('family_reunion', 'children_count')),
+
+    # Spouse
+    _spouse_required('spouse_name', 'Eş ekle işaretlendi, eş adı soyadı zorunludur!'),
+    _spouse_required('spouse_birth_date', 'Eş ekle işaretlendi, eş doğum tarihi zorunludur!'),
+    _spouse_required('spouse_birth_place', 'Eş ekle işaretlendi, eş doğum yeri zorunludur!'),
+    _spouse_required('spouse_phone', 'Eş ekle işaretlendi, eş telefon zorunludur!'),
+    _spouse_required('spouse_email', 'Eş ekle işaretlendi, eş e-posta zorunludur!'),
+    _spouse_required('spouse_passport_has', 'Eş ekle işaretlendi, eş pasaport durumu zorunludur!'),
+    _spouse_required('spouse_german_certificate', 'Eş ekle işaretlendi, eş Almanca sertifikası durumu zorunludur!'),
+    _required_if('spouse_passport_has', ('evet',), 'spouse_passport_no',
+                 'Eş pasaportu var olarak işaretlendi, pasaport numarası zorunludur!'),
+    _required_if('spouse_passport_has', ('evet',), 'spouse_passport_valid_until',
+                 'Eş pasaportu var olarak işaretlendi, geçerlilik tarihi zorunludur!'),
+    _required_if('spouse_passport_has', ('evet',), 'spouse_passport_photo_id',
+                 'Eş pasaportu var olarak işaretlendi, pasaport fotoğrafı zorunludur!'),
+
+    # Language certificate
+    _required_if('has_language_certificate', ('evet',), 'language_certificate_type',
+                 'Dil sertifikası var olarak işaretlendi, sertifika türü zorunludur!'),
+    _required_if('has_language_certificate', ('evet',), 'language_certificate_doc_id',
+                 'Dil sertifikası var olarak işaretlendi, sertifika belgesi zorunludur!'),
+
+    # Recognition
+    _required_if('recognition_status', RECOGNITION_DONE, 'recognition_state',
+                 'Denklik yapıldı/devam ediyor olarak işaretlendi, eyalet zorunludur!'),
+    _required_if('recognition_status', RECOGNITION_DONE, 'recognition_applied_at',
+                 'Denklik yapıldı/devam ediyor olarak işaretlendi, başvuru tarihi zorunludur!'),
+    _required_if('recognition_status', RECOGNITION_DONE, 'recognition_received_at',
+                 'Denklik yapıldı/devam ediyor olarak işaretlendi, alış tarihi zorunludur!'),
+
+    # Preferences
+    ApplicationRule(
+        ('choice1', 'choice2', 'choice3'),
+        lambda rec, today: len({rec.choice1.id, rec.choice2.id, rec.choice3.id}) != 3,
+        'Üç tercih de birbirinden farklı olmalıdır!'),
+
+    # Consent
+    ApplicationRule(
+        ('consent_ok',),
+        lambda rec, today: not rec.consent_ok,
+        'Başvuruyu göndermek için onay kutusunu işaretlemelisiniz!'),
+)
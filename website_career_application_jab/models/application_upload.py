@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import os
+import secrets
+from datetime import timedelta
+from functools import partial
+
+from odoo import models, fields, api
+from odoo.tools import config
+
+# Hours after which a staged upload is removed, with its document unless
+# an application claimed it
+UPLOAD_EXPIRY_HOURS = 24
+
+
+def _remove_staging_file(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class CareerApplicationUpload(models.Model):
+    """
+    Document uploaded in chunks from the website form ahead of the final
+    submit. The chunks are appended to a staging file in the filestore and
+    the complete document becomes an attachment, which the submit claims
+    through the token of the upload. Uploads expire after
+    UPLOAD_EXPIRY_HOURS.
+    """
+    _name = 'coflow.career.application.upload'
+    _description = 'Career Application - Staged Upload'
+    _order = 'create_date desc, id desc'
+
+    token = fields.Char(
+        string='Token',
+        required=True,
+        readonly=True,
+        index=True,
+        default=lambda self: secrets.token_urlsafe(32),
+        help='Secret the form uses to send the chunks and claim the document'
+    )
+    input_name = fields.Char(
+        string='Form Input',
+        required=True,
+        help='Name of the file input of the form'
+    )
+    filename = fields.Char(
+        string='File Name',
+        required=True
+    )
+    mimetype = fields.Char(
+        string='Mime Type'
+    )
+    size = fields.Integer(
+        string='Size',
+        required=True,
+        help='Size of the document in bytes'
+    )
+    received = fields.Integer(
+        string='Received',
+        default=0,
+        help='Bytes received so far'
+    )
+    state = fields.Selection([
+        ('uploading', 'Yükleniyor'),
+        ('done', 'Tamamlandı'),
+        ('claimed', 'Kullanıldı'),
+    ], string='Durum', default='uploading', required=True)
+    attachment_id = fields.Many2one(
+        'ir.attachment',
+        string='Belge',
+        ondelete='set null',
+        help='Attachment created once the upload is complete'
+    )
+
+    _sql_constraints = [
+        ('token_uniq', 'unique(token)', 'Upload token must be unique!')
+    ]
+
+    def _get_staging_path(self):
+        """Path of the file the chunks of the upload are appended to"""
+        self.ensure_one()
+        directory = os.path.join(config.filestore(self.env.cr.dbname), 'career_uploads')
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, self.token)
+
+    def _write_chunk(self, offset, data):
+        """
+        Write the chunk data at offset. The upload row is locked so the
+        chunks of a document are written one at a time, and a chunk must
+        start at the received size: after an error the form resumes from
+        there. The attachment is created with the last chunk.
+
+        :return: True if the chunk was written
+        """
+        self.ensure_one()
+        self.env.cr.execute(
+            'SELECT received FROM coflow_career_application_upload WHERE id = %s FOR UPDATE',
+            [self.id])
+        received = self.env.cr.fetchone()[0]
+        if self.state != 'uploading' or offset != received or received + len(data) > self.size:
+            return False
+        with open(self._get_staging_path(), 'ab') as staging:
+            # Drop the bytes of a chunk whose transaction was rolled back
+            staging.truncate(received)
+            staging.write(data)
+        self.received = received + len(data)
+        if self.received == self.size:
+            self._finalize()
+        return True
+
+    def _finalize(self):
+        """Turn the complete staging file into the attachment of the upload"""
+        self.ensure_one()
+        path = self._get_staging_path()
+        with open(path, 'rb') as staging:
+            attachment = self.env['ir.attachment'].sudo()._create_from_stream(staging, {
+                'name': self.filename,
+                'mimetype': self.mimetype,
+                'res_model': 'coflow.career.application',
+            })
+        self.write({
+            'attachment_id': attachment.id,
+            'state': 'done',
+        })
+        self.env.cr.postcommit.add(partial(_remove_staging_file, path))
+
+    @api.model
+    def _claim(self, token, input_name, name_prefix):
+        """
+        Return the attachment of the complete upload token of input_name,
+        with its name prefixed by name_prefix. An upload is claimed once:
+        the token of an upload already claimed, by a double submit or a
+        replayed request, is treated as missing. A submit that fails rolls
+        its claims back, so the form can be submitted again.
+        """
+        self.flush_model(['state'])
+        self.env.cr.execute("""
+            UPDATE coflow_career_application_upload
+               SET state = 'claimed'
+             WHERE token = %s AND input_name = %s AND state = 'done'
+         RETURNING id
+        """, [token, input_name])
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.env['ir.attachment']
+        upload = self.browse(row[0])
+        upload.invalidate_recordset(['state'])
+        upload.attachment_id.name = f'{name_prefix}_{upload.filename.lower()}'
+        return upload.attachment_id
+
+    @api.autovacuum
+    def _gc_expired_uploads(self):
+        """Remove the expired uploads, their staging files and their
+        documents if no application claimed them"""
+        expired = self.search([
+            ('create_date', '<', fields.Datetime.now() - timedelta(hours=UPLOAD_EXPIRY_HOURS)),
+        ])
+        for upload in expired.filtered(lambda u: u.state == 'uploading'):
+            self.env.cr.postcommit.add(partial(_remove_staging_file, upload._get_staging_path()))
+        expired.filtered(lambda u: u.state == 'done').attachment_id.unlink()
+        expired.unlink()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+from odoo import models, fields, tools
+
+
+class CareerDocumentDedupReport(models.Model):
+    """
+    Stored files shared by several career application documents, with the
+    storage the deduplication saves.
+    """
+    _name = 'coflow.career.document.dedup.report'
+    _description = 'Career Application - Document Deduplication Report'
+    _auto = False
+    _rec_name = 'checksum'
+    _order = 'saved_bytes desc'
+
+    checksum = fields.Char(string='Checksum', readonly=True)
+    mimetype = fields.Char(string='Mime Type', readonly=True)
+    document_count = fields.Integer(string='Belge Sayısı', readonly=True)
+    file_size = fields.Integer(string='Dosya Boyutu (bayt)', readonly=True)
+    saved_bytes = fields.Integer(string='Kazanılan Alan (bayt)', readonly=True)
+    saved_mb = fields.Float(string='Kazanılan Alan (MB)', readonly=True, digits=(16, 2))
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE VIEW {self._table} AS (
+                SELECT min(id) AS id,
+                       checksum,
+                       min(mimetype) AS mimetype,
+                       count(*) AS document_count,
+                       max(file_size) AS file_size,
+                       (count(*) - 1) * max(file_size) AS saved_bytes,
+                       (count(*) - 1) * max(file_size) / 1048576.0 AS saved_mb
+                  FROM ir_attachment
+                 WHERE res_model = 'coflow.career.application'
+                   AND store_fname IS NOT NULL
+                 GROUP BY checksum
+                HAVING count(*) > 1
+            )
+        """)
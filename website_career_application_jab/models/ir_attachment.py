@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import base64
+import hashlib
+import io
+import logging
+import os
+import uuid
+from functools import partial
+
+from PIL import Image
+
+from odoo import models, fields, api
+from odoo.tools.image import image_fix_orientation
+
+_logger = logging.getLogger(__name__)
+
+# Bytes copied at a time from an uploaded file to the filestore
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Longest side in pixels and quality of the normalized document images
+DOCUMENT_IMAGE_MAX_SIZE = 2048
+DOCUMENT_IMAGE_QUALITY = 85
+
+# Longest side in pixels of the backend preview thumbnails
+DOCUMENT_THUMBNAIL_SIZE = 256
+
+# Document inputs whose files are kept as uploaded (official certificates
+# that may have to be forwarded unaltered), they only get a thumbnail
+ORIGINAL_DOCUMENT_INPUTS = (
+    'criminal_record_doc',
+    'language_certificate_doc',
+    'formul_a_b_doc',
+)
+
+
+class IrAttachment(models.Model):
+    """
+    Create attachments from uploaded files without loading them in memory,
+    and normalize the images of the career application documents.
+    """
+    _inherit = 'ir.attachment'
+
+    career_thumbnail = fields.Binary(
+        string='Önizleme',
+        attachment=False,
+        help='Preview of a career application document image'
+    )
+    career_original_checksum = fields.Char(
+        string='Orijinal Checksum',
+        index='btree_not_null',
+        help='Checksum of a career application document as uploaded, '
+             'before its normalization'
+    )
+    career_keep_original = fields.Boolean(
+        string='Orijinal Dosya',
+        help='The stored file of the career application document was kept '
+             'as uploaded instead of being normalized'
+    )
+    career_scan_state = fields.Selection(
+        [('clean', 'Temiz'), ('infected', 'Virüslü')],
+        string='Virüs Taraması',
+        help='Result of the virus scan of a career application document'
+    )
+
+    @api.model
+    def _create_from_stream(self, stream, vals):
+        """
+        Create an attachment with vals and the content of the file object
+        stream, copied to the filestore in chunks while its checksum is
+        computed, so that neither the raw nor the base64 content is ever
+        held in memory. Databases storing attachments in the database get
+        a regular create.
+        """
+        if self._storage() != 'file':
+            return self.create(dict(vals, raw=stream.read()))
+
+        sha = hashlib.sha1()
+        size = 0
+        # Created like the files of _file_write(), with the permissions the
+        # umask of the process gives them
+        tmp_path = os.path.join(self._filestore(), f'.career-upload-{uuid.uuid4().hex}')
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), 'wb') as tmp:
+            try:
+                for chunk in iter(partial(stream.read, STREAM_CHUNK_SIZE), b''):
+                    sha.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        # Same layout as _file_write(), the checksum is the file name
+        checksum = sha.hexdigest()
+        fname = f'{checksum[:2]}/{checksum}'
+        full_path = self._full_path(fname)
+        if os.path.exists(full_path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(tmp_path, full_path)
+            # removed by the filestore GC if the transaction aborts
+            self._mark_for_gc(fname)
+
+        # create() and write() drop the content fields, set them directly
+        attachment = self.create(vals)
+        self.env.cr.execute("""
+            UPDATE ir_attachment
+               SET store_fname = %s, checksum = %s, file_size = %s, db_datas = NULL
+             WHERE id = %s
+        """, [fname, checksum, size, attachment.id])
+        attachment.invalidate_recordset(['store_fname', 'checksum', 'file_size', 'db_datas', 'raw', 'datas'])
+        return attachment
+
+    def _normalize_career_document(self, input_name):
+        """
+        Normalize the images uploaded in the form input input_name: apply
+        their EXIF orientation, downscale them to DOCUMENT_IMAGE_MAX_SIZE and
+        recompress them, which also drops their metadata. Every image gets a
+        preview thumbnail, the documents of ORIGINAL_DOCUMENT_INPUTS keep
+        their original file. PDF documents are left as they are.
+        """
+        keep_original = input_name in ORIGINAL_DOCUMENT_INPUTS
+        for attachment in self:
+            # A document uploaded before shares the result of its processing
+            # when it was normalized too. A document kept as uploaded only
+            # shares a stored file identical to its own, never a downscaled
+            # or recompressed one.
+            domain = [
+                ('career_original_checksum', '=', attachment.checksum),
+                ('res_model', '=', 'coflow.career.application'),
+                ('store_fname', '!=', False),
+                ('id', '!=', attachment.id),
+            ]
+            if keep_original:
+                domain.append(('checksum', '=', attachment.checksum))
+            else:
+                domain.append(('career_keep_original', '=', False))
+            twin = attachment.store_fname and self.search(domain, limit=1)
+            if twin:
+                attachment._share_career_document(twin)
+                continue
+            attachment.write({
+                'career_original_checksum': attachment.checksum,
+                'career_keep_original': keep_original,
+            })
+            if attachment.mimetype not in ('image/jpeg', 'image/png'):
+                continue
+            source = (attachment._full_path(attachment.store_fname) if attachment.store_fname
+                      else io.BytesIO(attachment.raw))
+            try:
+                image = image_fix_orientation(Image.open(source))
+                image.load()
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                _logger.info("Could not normalize document %s: %s", attachment.id, e)
+                continue
+
+            vals = {}
+            # downscaled first so the thumbnail is made from the smaller image
+            image.thumbnail((DOCUMENT_IMAGE_MAX_SIZE, DOCUMENT_IMAGE_MAX_SIZE), Image.LANCZOS)
+            if not keep_original:
+                vals['raw'] = self._save_career_image(
+                    image, 'PNG' if attachment.mimetype == 'image/png' else 'JPEG')
+            image.thumbnail((DOCUMENT_THUMBNAIL_SIZE, DOCUMENT_THUMBNAIL_SIZE), Image.LANCZOS)
+            vals['career_thumbnail'] = base64.b64encode(self._save_career_image(image, 'JPEG'))
+            attachment.write(vals)
+
+    def _share_career_document(self, twin):
+        """
+        Point the attachment at the stored file, thumbnail and checksums of
+        twin, an attachment of the same uploaded content, so that the file
+        is stored once while each application keeps its own attachment.
+        """
+        self.ensure_one()
+        fname = self.store_fname
+        self.env.cr.execute("""
+            UPDATE ir_attachment a
+               SET store_fname = t.store_fname,
+                   checksum = t.checksum,
+                   file_size = t.file_size,
+                   mimetype = t.mimetype,
+                   career_thumbnail = t.career_thumbnail,
+                   career_original_checksum = t.career_original_checksum,
+                   career_keep_original = t.career_keep_original
+              FROM ir_attachment t
+             WHERE a.id = %s AND t.id = %s
+        """, [self.id, twin.id])
+        self.invalidate_recordset()
+        if fname != self.store_fname:
+            # removed by the filestore GC unless another attachment uses it
+            self._file_delete(fname)
+
+    @api.model
+    def _save_career_image(self, image, output_format):
+        """Encode the Pillow image without its metadata"""
+        if output_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        elif image.mode not in ('1', 'L', 'P', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        stream = io.BytesIO()
+        if output_format == 'JPEG':
+            image.save(stream, 'JPEG', quality=DOCUMENT_IMAGE_QUALITY, optimize=True)
+        else:
+            image.save(stream, 'PNG', optimize=True)
+        return stream.getvalue()
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from odoo import models
+from odoo.http import request
+
+
+class IrHttp(models.AbstractModel):
+    """
+    Reject the requests whose body exceeds the max_content_length of their
+    route, before the body is read.
+    """
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _pre_dispatch(cls, rule, args):
+        max_content_length = rule.endpoint.routing.get('max_content_length')
+        if max_content_length:
+            httprequest = request.httprequest
+            if (httprequest.content_length or 0) > max_content_length:
+                raise RequestEntityTooLarge()
+            # Also enforced by werkzeug while it parses the body
+            httprequest.max_content_length = max_content_length
+        super()._pre_dispatch(rule, args)
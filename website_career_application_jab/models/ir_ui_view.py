@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+import hashlib
+
+from odoo import models, fields, api, tools
+from odoo.http import request
+
+# Stands for the CSRF token of the request in the cached application form
+CSRF_PLACEHOLDER = '__career_application_csrf_token__'
+
+
+class IrUiView(models.Model):
+    """
+    Cache of the application form page as rendered for anonymous visitors.
+    """
+    _inherit = 'ir.ui.view'
+
+    @api.model
+    @tools.ormcache('template', 'website_id', 'lang', 'version', cache='templates.cached_values')
+    def _render_career_form_page(self, template, website_id, lang, version, values):
+        """
+        Render the application form once per website, language and master
+        data version, 'values' must only depend on them. The page is
+        rendered with a placeholder for the CSRF token of the request, which
+        changes every second and could not be found again in the rendered
+        HTML. The cache is cleared when the views or the master data change.
+
+        :return: tuple of the HTML, a hash of it and the render time
+        """
+        request.csrf_token = lambda *args, **kwargs: CSRF_PLACEHOLDER
+        try:
+            html = str(request.render(template, values).render())
+        finally:
+            del request.csrf_token
+        return html, hashlib.sha1(html.encode()).hexdigest(), fields.Datetime.now()
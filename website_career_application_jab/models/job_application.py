@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 # License LGPL-3
 
-import re
 import base64
-from odoo import models, fields, api
+from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from .application_rules import APPLICATION_RULES
 
 # Constants for selections
 GENDER_SELECTION = [
@@ -241,6 +241,12 @@ class CareerApplication(models.Model):
         help='Passport photo attachment (required if passport exists)'
     )
 
+    passport_photo_preview = fields.Binary(
+        related='passport_photo_id.career_thumbnail',
+        string='Pasaport Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     # ==================== DISABILITY INFORMATION ====================
 
     disability = fields.Selection(
@@ -262,6 +268,12 @@ class CareerApplication(models.Model):
         help='Disability certificate (required if disability exists)'
     )
 
+    disability_doc_preview = fields.Binary(
+        related='disability_doc_id.career_thumbnail',
+        string='Engellilik Belgesi Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     # ==================== MILITARY STATUS (For males only) ====================
 
     military_status = fields.Selection(
@@ -281,6 +293,12 @@ class CareerApplication(models.Model):
         help='Military postponement document (required if postponed)'
     )
 
+    military_postpone_doc_preview = fields.Binary(
+        related='military_postpone_doc_id.career_thumbnail',
+        string='Tecil Belgesi Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     # ==================== CRIMINAL RECORD ====================
 
     criminal_record = fields.Selection(
@@ -296,6 +314,12 @@ class CareerApplication(models.Model):
         help='Criminal record certificate (always required)'
     )
 
+    criminal_record_doc_preview = fields.Binary(
+        related='criminal_record_doc_id.career_thumbnail',
+        string='Adli Sicil Belgesi Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     # ==================== FAMILY REUNION ====================
 
     family_reunion = fields.Selection(
@@ -367,6 +391,12 @@ class CareerApplication(models.Model):
         help='Spouse passport photo (required if spouse has passport)'
     )
 
+    spouse_passport_photo_preview = fields.Binary(
+        related='spouse_passport_photo_id.career_thumbnail',
+        string='Eş Pasaport Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     spouse_german_certificate = fields.Selection(
         YES_NO_SELECTION,
         string='Eş Almanca Sertifikası',
@@ -412,6 +442,12 @@ class CareerApplication(models.Model):
         help='Language certificate document (required if certificate exists)'
     )
 
+    language_certificate_doc_preview = fields.Binary(
+        related='language_certificate_doc_id.career_thumbnail',
+        string='Dil Sertifikası Önizleme',
+        help='Thumbnail of the document image'
+    )
+
     # ==================== RECOGNITION (Denklik) ====================
 
     recognition_status = fields.Selection(
@@ -556,197 +592,64 @@ class CareerApplication(models.Model):
 
     # ==================== VALIDATION METHODS ====================
 
-    @api.constrains('email')
-    def _check_email(self):
-        """Validate email format"""
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        for record in self:
-            if record.email and not re.match(email_regex, record.email):
-                raise ValidationError('Geçersiz e-posta adresi formatı!')
-
-    @api.constrains('phone')
-    def _check_phone(self):
-        """Validate phone format"""
-        phone_regex = r'^[\d\s\+\-\(\)]+$'
-        for record in self:
-            if record.phone and not re.match(phone_regex, record.phone):
-                raise ValidationError('Geçersiz telefon numarası formatı!')
-            if record.phone and len(record.phone.replace(' ', '').replace('+', '').replace('-', '').replace('(', '').replace(')', '')) < 10:
-                raise ValidationError('Telefon numarası en az 10 rakam içermelidir!')
-
-    @api.constrains('spouse_email')
-    def _check_spouse_email(self):
-        """Validate spouse email format"""
-        email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        for record in self:
-            if record.spouse_email and not re.match(email_regex, record.spouse_email):
-                raise ValidationError('Geçersiz eş e-posta adresi formatı!')
-
-    @api.constrains('spouse_phone')
-    def _check_spouse_phone(self):
-        """Validate spouse phone format"""
-        phone_regex = r'^[\d\s\+\-\(\)]+$'
-        for record in self:
-            if record.spouse_phone and not re.match(phone_regex, record.spouse_phone):
-                raise ValidationError('Geçersiz eş telefon numarası formatı!')
-
-    @api.constrains('birth_date')
-    def _check_birth_date(self):
-        """Validate birth date is in the past and applicant is old enough"""
-        for record in self:
-            if record.birth_date:
-                if record.birth_date >= fields.Date.today():
-                    raise ValidationError('Doğum tarihi bugünden önce olmalıdır!')
-
-                # Check minimum age (e.g., 18 years)
-                age = (fields.Date.today() - record.birth_date).days / 365.25
-                if age < 18:
-                    raise ValidationError('Başvuru sahibi en az 18 yaşında olmalıdır!')
-
-    @api.constrains('gender', 'military_status')
-    def _check_military_status(self):
-        """Validate military status for male applicants"""
-        for record in self:
-            if record.gender == 'erkek' and not record.military_status:
-                raise ValidationError('Erkek başvuru sahipleri için askerlik durumu zorunludur!')
-
-    @api.constrains('military_status', 'military_postpone_until', 'military_postpone_doc_id')
-    def _check_military_postponement(self):
-        """Validate military postponement fields"""
-        for record in self:
-            if record.military_status == 'tecilli':
-                if not record.military_postpone_until:
-                    raise ValidationError('Tecilli askerlik için tecil bitiş tarihi zorunludur!')
-                if not record.military_postpone_doc_id:
-                    raise ValidationError('Tecilli askerlik için tecil belgesi zorunludur!')
-
-    @api.constrains('passport_has', 'passport_no', 'passport_valid_until', 'passport_photo_id')
-    def _check_passport_fields(self):
-        """Validate passport fields"""
-        for record in self:
-            if record.passport_has == 'evet':
-                if not record.passport_no:
-                    raise ValidationError('Pasaport var olarak işaretlendi, pasaport numarası zorunludur!')
-                if not record.passport_valid_until:
-                    raise ValidationError('Pasaport var olarak işaretlendi, geçerlilik tarihi zorunludur!')
-                if not record.passport_photo_id:
-                    raise ValidationError('Pasaport var olarak işaretlendi, pasaport fotoğrafı zorunludur!')
-
-    @api.constrains('passport_valid_until')
-    def _check_passport_validity(self):
-        """Check that passport is not expired"""
-        for record in self:
-            if record.passport_valid_until and record.passport_valid_until < fields.Date.today():
-                raise ValidationError('Pasaport geçerlilik tarihi geçmiş olamaz!')
-
-    @api.constrains('disability', 'disability_note', 'disability_doc_id')
-    def _check_disability_fields(self):
-        """Validate disability fields"""
-        for record in self:
-            if record.disability == 'var':
-                if not record.disability_note:
-                    raise ValidationError('Engellilik var olarak işaretlendi, açıklama zorunludur!')
-                if not record.disability_doc_id:
-                    raise ValidationError('Engellilik var olarak işaretlendi, belge zorunludur!')
-
-    @api.constrains('criminal_record', 'criminal_record_doc_id')
-    def _check_criminal_record(self):
-        """Validate criminal record document is always provided"""
-        for record in self:
-            if record.criminal_record and not record.criminal_record_doc_id:
-                raise ValidationError('Adli sicil belgesi zorunludur!')
-
-    @api.constrains('family_reunion', 'children_count')
-    def _check_children_count(self):
-        """Validate children count"""
-        for record in self:
-            if record.family_reunion == 'evet':
-                if record.children_count < 0 or record.children_count > 2:
-                    raise ValidationError('Çocuk sayısı 0-2 arasında olmalıdır!')
-
-    @api.constrains('family_reunion', 'has_spouse', 'spouse_name', 'spouse_birth_date',
-                    'spouse_birth_place', 'spouse_phone', 'spouse_email',
-                    'spouse_passport_has', 'spouse_german_certificate')
-    def _check_spouse_fields(self):
-        """Validate spouse fields"""
-        for record in self:
-            if record.family_reunion == 'evet' and record.has_spouse:
-                if not record.spouse_name:
-                    raise ValidationError('Eş ekle işaretlendi, eş adı soyadı zorunludur!')
-                if not record.spouse_birth_date:
-                    raise ValidationError('Eş ekle işaretlendi, eş doğum tarihi zorunludur!')
-                if not record.spouse_birth_place:
-                    raise ValidationError('Eş ekle işaretlendi, eş doğum yeri zorunludur!')
-                if not record.spouse_phone:
-                    raise ValidationError('Eş ekle işaretlendi, eş telefon zorunludur!')
-                if not record.spouse_email:
-                    raise ValidationError('Eş ekle işaretlendi, eş e-posta zorunludur!')
-                if not record.spouse_passport_has:
-                    raise ValidationError('Eş ekle işaretlendi, eş pasaport durumu zorunludur!')
-                if not record.spouse_german_certificate:
-                    raise ValidationError('Eş ekle işaretlendi, eş Almanca sertifikası durumu zorunludur!')
-
-    @api.constrains('spouse_passport_has', 'spouse_passport_no',
-                    'spouse_passport_valid_until', 'spouse_passport_photo_id')
-    def _check_spouse_passport(self):
-        """Validate spouse passport fields"""
-        for record in self:
-            if record.spouse_passport_has == 'evet':
-                if not record.spouse_passport_no:
-                    raise ValidationError('Eş pasaportu var olarak işaretlendi, pasaport numarası zorunludur!')
-                if not record.spouse_passport_valid_until:
-                    raise ValidationError('Eş pasaportu var olarak işaretlendi, geçerlilik tarihi zorunludur!')
-                if not record.spouse_passport_photo_id:
-                    raise ValidationError('Eş pasaportu var olarak işaretlendi, pasaport fotoğrafı zorunludur!')
-
-    @api.constrains('family_reunion', 'children_count', 'child_ids')
-    def _check_children_records(self):
-        """Validate that number of child records matches children_count"""
-        for record in self:
-            if record.family_reunion == 'evet':
-                if len(record.child_ids) != record.children_count:
-                    raise ValidationError(
-                        f'Çocuk sayısı {record.children_count} olarak belirtildi, '
-                        f'ancak {len(record.child_ids)} çocuk kaydı var!'
-                    )
-
-    @api.constrains('has_language_certificate', 'language_certificate_type', 'language_certificate_doc_id')
-    def _check_language_certificate(self):
-        """Validate language certificate fields"""
-        for record in self:
-            if record.has_language_certificate == 'evet':
-                if not record.language_certificate_type:
-                    raise ValidationError('Dil sertifikası var olarak işaretlendi, sertifika türü zorunludur!')
-                if not record.language_certificate_doc_id:
-                    raise ValidationError('Dil sertifikası var olarak işaretlendi, sertifika belgesi zorunludur!')
-
-    @api.constrains('recognition_status', 'recognition_state',
-                    'recognition_applied_at', 'recognition_received_at')
-    def _check_recognition_fields(self):
-        """Validate recognition fields"""
-        for record in self:
-            if record.recognition_status in ('evet', 'devam-ediyor'):
-                if not record.recognition_state:
-                    raise ValidationError('Denklik yapıldı/devam ediyor olarak işaretlendi, eyalet zorunludur!')
-                if not record.recognition_applied_at:
-                    raise ValidationError('Denklik yapıldı/devam ediyor olarak işaretlendi, başvuru tarihi zorunludur!')
-                if not record.recognition_received_at:
-                    raise ValidationError('Denklik yapıldı/devam ediyor olarak işaretlendi, alış tarihi zorunludur!')
-
-    @api.constrains('choice1', 'choice2', 'choice3')
-    def _check_choices_unique(self):
-        """Validate that all three choices are different"""
-        for record in self:
-            choices = [record.choice1.id, record.choice2.id, record.choice3.id]
-            if len(choices) != len(set(choices)):
-                raise ValidationError('Üç tercih de birbirinden farklı olmalıdır!')
-
-    @api.constrains('consent_ok')
-    def _check_consent(self):
-        """Validate that consent is checked"""
-        for record in self:
-            if not record.consent_ok:
-                raise ValidationError('Başvuruyu göndermek için onay kutusunu işaretlemelisiniz!')
+    def _validate_fields(self, field_names, excluded_names=()):
+        """
+        Validate the records against the rules of APPLICATION_RULES reading
+        the written fields, reporting every violation at once. Rules on other
+        fields are not evaluated again: editing the phone of an application
+        whose passport has expired since does not fail.
+        """
+        field_names = set(field_names)
+        excluded_names = set(excluded_names)
+        super()._validate_fields(field_names, excluded_names)
+        violations = self._get_rule_violations(field_names, excluded_names)
+        if violations:
+            raise ValidationError('\n'.join(dict.fromkeys(message for field_names, message in violations)))
+
+    def _get_rule_violations(self, field_names=None, excluded_names=frozenset()):
+        """
+        Helper method checking APPLICATION_RULES on the records in a single
+        pass. Rules are evaluated column by column over the whole recordset,
+        so the values are fetched once for all the records.
+
+        :param field_names: only check the rules reading one of these fields,
+                            all the rules by default
+        :param excluded_names: skip the rules reading one of these fields, as
+                               the ORM does for the fields validated after
+                               their inverse
+        :return: list of (field names, message) tuples
+        """
+        today = fields.Date.today()
+        violations = []
+        for rule in APPLICATION_RULES:
+            rule_fields = rule.fields + rule.depends
+            if field_names is not None and field_names.isdisjoint(rule_fields):
+                continue
+            if not excluded_names.isdisjoint(rule_fields):
+                continue
+            for record in self:
+                if rule.violated(record, today):
+                    message = rule.message(record) if callable(rule.message) else rule.message
+                    violations.append((list(rule.fields), message))
+        return violations
+
+    @api.model
+    def _get_validation_errors(self, vals):
+        """
+        Run the required field checks and the rules of APPLICATION_RULES on
+        a new record built from vals, collecting all the violations instead
+        of stopping at the first one. Nothing is written to the database.
+
+        :return: list of (field names, message) tuples
+        """
+        record = self.new(vals)
+        errors = []
+        for name, field in self._fields.items():
+            if field.required and field.default is None and not record[name]:
+                errors.append(([name], f'{field.string} alanı zorunludur!'))
+        # The rule table reports each violation on its own fields
+        errors += record._get_rule_violations()
+        return errors
 
     # ==================== CRUD METHODS ====================
 
@@ -757,6 +660,19 @@ class CareerApplication(models.Model):
             vals['consent_name'] = vals['full_name']
         return super(CareerApplication, self).create(vals)
 
+    @api.model
+    def _create_from_website(self, vals):
+        """
+        Create an application submitted from the website form without the
+        per-field tracking values and the follower subscriptions of the
+        mail.thread creation, logging a single message instead. Later edits
+        of the application are tracked as usual.
+        """
+        application = self.with_context(tracking_disable=True).create(vals)
+        application = self.browse(application.id)
+        application._message_log(body=_('Başvuru web sitesi formundan alındı.'))
+        return application
+
     def write(self, vals):
         """Override write to update consent_name if full_name changes"""
         if 'full_name' in vals and 'consent_name' not in vals:
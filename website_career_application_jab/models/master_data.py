@@ -1,7 +1,58 @@
 # -*- coding: utf-8 -*-
 # License LGPL-3
 
-from odoo import models, fields, api
+from collections import namedtuple
+
+from odoo import models, fields, api, tools
+
+# Option of a master data selection list, as cached for the website form
+MasterDataOption = namedtuple('MasterDataOption', ['id', 'name', 'is_other'])
+
+
+class CareerMasterDataMixin(models.AbstractModel):
+    """
+    Cache of the active master data records shown on the website form.
+    The records change a few times a year, so the form reads a snapshot
+    per language instead of searching on every render.
+    """
+    _name = 'coflow.career.master.data.mixin'
+    _description = 'Career Master Data Mixin'
+
+    @api.model
+    def _get_form_options(self):
+        """
+        Return the active records as a tuple of MasterDataOption, in the
+        model order and with the names in the current language.
+
+        The snapshot is keyed on the number of records and their last write
+        date, so a change is seen by every worker without clearing the other
+        caches of the registry.
+        """
+        [(count, write_date)] = self.sudo().with_context(active_test=False)._read_group(
+            [], aggregates=['__count', 'write_date:max'])
+        return self._read_form_options(self.env.lang, count, write_date)
+
+    @api.model
+    @tools.ormcache('lang', 'count', 'write_date')
+    def _read_form_options(self, lang, count, write_date):
+        """
+        Helper method reading the options of _get_form_options, cached per
+        language and version of the records
+        """
+        records = self.sudo().with_context(active_test=True).search([])
+        return tuple(
+            MasterDataOption(record.id, record.name, record.is_other)
+            for record in records
+        )
+
+    def update_field_translations(self, field_name, translations):
+        """Bump the write date so the translated names reach the form"""
+        res = super().update_field_translations(field_name, translations)
+        self.env.cr.execute(
+            f"UPDATE {self._table} SET write_date = (now() at time zone 'UTC') WHERE id IN %s",
+            [tuple(self.ids)])
+        self.invalidate_recordset(['write_date'])
+        return res
 
 
 class HospitalDepartment(models.Model):
@@ -10,6 +61,7 @@ class HospitalDepartment(models.Model):
     Used in experience records and job preferences.
     """
     _name = 'coflow.hospital.department'
+    _inherit = ['coflow.career.master.data.mixin']
     _description = 'Hospital Department'
     _order = 'sequence, name'
 
@@ -46,6 +98,7 @@ class MedicalDevice(models.Model):
     Used in experience records to track device usage.
     """
     _name = 'coflow.medical.device'
+    _inherit = ['coflow.career.master.data.mixin']
     _description = 'Medical Device'
     _order = 'sequence, name'
 
@@ -847,6 +847,35 @@ console.log('=== Career Application Form JS Loaded ===');
         });
         
 
+        // Master data of the experience selections, loaded once from the
+        // versioned JSON endpoint and cloned into every select
+        const masterDataOptions = {};
+        const applicationForm = document.getElementById('careerApplicationForm');
+        const masterDataUrl = applicationForm && applicationForm.dataset.masterDataUrl;
+
+        function fillMasterDataSelects(root) {
+            root.querySelectorAll('select[data-master]').forEach(select => {
+                const options = masterDataOptions[select.dataset.master];
+                if (options && !select.options.length) {
+                    select.appendChild(options.cloneNode(true));
+                }
+            });
+        }
+
+        if (masterDataUrl) {
+            fetch(masterDataUrl, { credentials: 'same-origin' })
+                .then(response => response.ok ? response.json() : Promise.reject(response.status))
+                .then(data => {
+                    ['departments', 'devices'].forEach(key => {
+                        const fragment = document.createDocumentFragment();
+                        (data[key] || []).forEach(([id, name]) => fragment.appendChild(new Option(name, id)));
+                        masterDataOptions[key] = fragment;
+                    });
+                    fillMasterDataSelects(document);
+                })
+                .catch(error => console.error('Master data could not be loaded:', error));
+        }
+
         // Add Experience Entry
         let experienceCount = 1;
         const addExperienceBtn = document.getElementById('addExperienceBtn');
@@ -854,10 +883,6 @@ console.log('=== Career Application Form JS Loaded ===');
             addExperienceBtn.addEventListener('click', function() {
                 experienceCount++;
                 const container = document.getElementById('experienceContainer');
-                const departments = Array.from(document.querySelectorAll('select[name="experience_departments_1"] option'))
-                    .map(opt => `<option value="${opt.value}">${opt.text}</option>`).join('');
-                const devices = Array.from(document.querySelectorAll('select[name="experience_devices_1"] option'))
-                    .map(opt => `<option value="${opt.value}">${opt.text}</option>`).join('');
 
                 const html = `
                     <div class="experience-entry mb-3 p-3 border rounded">
@@ -885,15 +910,11 @@ console.log('=== Career Application Form JS Loaded ===');
                             </div>
                             <div class="col-md-12 mb-2">
                                 <label class="form-label">Bölümler</label>
-                                <select class="form-select" multiple="multiple" name="experience_departments_${experienceCount}" size="4">
-                                    ${departments}
-                                </select>
+                                <select class="form-select" multiple="multiple" name="experience_departments_${experienceCount}" size="4" data-master="departments"></select>
                             </div>
                             <div class="col-md-12 mb-2">
                                 <label class="form-label">Cihazlar</label>
-                                <select class="form-select" multiple="multiple" name="experience_devices_${experienceCount}" size="4">
-                                    ${devices}
-                                </select>
+                                <select class="form-select" multiple="multiple" name="experience_devices_${experienceCount}" size="4" data-master="devices"></select>
                             </div>
                             <div class="col-md-12 mb-2">
                                 <label class="form-label">Yapılan İşler</label>
@@ -903,6 +924,7 @@ console.log('=== Career Application Form JS Loaded ===');
                     </div>
                 `;
                 container.insertAdjacentHTML('beforeend', html);
+                fillMasterDataSelects(container.lastElementChild);
             });
         }
 
@@ -988,6 +1010,178 @@ console.log('=== Career Application Form JS Loaded ===');
             form.addEventListener('input', liveValidate);
         }
 
+        // Staged uploads: documents are sent in chunks as soon as they are
+        // picked, and the final submit only references them by token
+        const uploadUrl = form && form.dataset.uploadUrl;
+        const uploadRetries = 5;
+        const pendingUploads = new Map();
+
+        function getCsrfToken() {
+            const csrfInput = form.querySelector('input[name="csrf_token"]');
+            return csrfInput ? csrfInput.value : '';
+        }
+
+        function getTokenInput(fileInput) {
+            let tokenInput = form.querySelector(`input[name="${fileInput.name}_token"]`);
+            if (!tokenInput) {
+                tokenInput = document.createElement('input');
+                tokenInput.type = 'hidden';
+                tokenInput.name = `${fileInput.name}_token`;
+                fileInput.after(tokenInput);
+            }
+            return tokenInput;
+        }
+
+        async function sendChunks(file, token, chunkSize) {
+            const chunkUrl = `${uploadUrl}/${token}`;
+            let offset = 0;
+            let failures = 0;
+            while (offset < file.size) {
+                try {
+                    const params = new URLSearchParams({ offset, csrf_token: getCsrfToken() });
+                    const response = await fetch(`${chunkUrl}?${params}`, {
+                        method: 'POST',
+                        body: file.slice(offset, offset + chunkSize),
+                        headers: { 'Content-Type': 'application/octet-stream' },
+                        credentials: 'same-origin',
+                    });
+                    // 409: the server expects another offset, resume from it
+                    if (response.status >= 400 && response.status < 500 && response.status !== 409) {
+                        // Refused document, e.g. its content is not a PDF, JPG or PNG
+                        const result = await response.json().catch(() => ({}));
+                        throw Object.assign(new Error(result.error || `HTTP ${response.status}`), { refused: true });
+                    }
+                    if (!response.ok && response.status !== 409) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    offset = (await response.json()).received;
+                    failures = 0;
+                } catch (error) {
+                    if (error.refused || ++failures > uploadRetries) {
+                        throw error;
+                    }
+                    await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+                    const status = await fetch(chunkUrl, { credentials: 'same-origin' })
+                        .then(response => response.json())
+                        .catch(() => null);
+                    if (status) {
+                        offset = status.received;
+                    }
+                }
+            }
+        }
+
+        async function stageUpload(fileInput) {
+            const file = fileInput.files[0];
+            const tokenInput = getTokenInput(fileInput);
+            const uploadId = String(Date.now());
+            fileInput.dataset.uploadId = uploadId;
+            tokenInput.value = '';
+
+            const formData = new FormData();
+            formData.append('csrf_token', getCsrfToken());
+            formData.append('input_name', fileInput.name);
+            formData.append('filename', file.name);
+            formData.append('size', file.size);
+            formData.append('mimetype', file.type);
+            const response = await fetch(uploadUrl, { method: 'POST', body: formData, credentials: 'same-origin' });
+            const result = await response.json();
+            if (!response.ok) {
+                markInvalid(fileInput);
+                showStepError(fileInput.closest('.form-step'), result.error);
+                return;
+            }
+            try {
+                await sendChunks(file, result.token, result.chunk_size);
+            } catch (error) {
+                if (error.refused) {
+                    markInvalid(fileInput);
+                    showStepError(fileInput.closest('.form-step'), error.message);
+                }
+                throw error;
+            }
+            // Only keep the token of the last file picked in the input
+            if (fileInput.dataset.uploadId === uploadId) {
+                tokenInput.value = result.token;
+            }
+        }
+
+        if (form && uploadUrl) {
+            form.addEventListener('change', function(e) {
+                const fileInput = e.target;
+                if (fileInput.type !== 'file') {
+                    return;
+                }
+                getTokenInput(fileInput).value = '';
+                if (!hasFile(fileInput)) {
+                    pendingUploads.delete(fileInput.name);
+                    return;
+                }
+                // On failure the document is sent with the form instead
+                pendingUploads.set(fileInput.name, stageUpload(fileInput).catch((error) => {
+                    console.error('Staged upload failed:', error);
+                }));
+            });
+        }
+
+        // Leave the staged documents out of the final submit
+        function disableStagedFileInputs() {
+            form.querySelectorAll('input[type="file"]').forEach((fileInput) => {
+                const tokenInput = form.querySelector(`input[name="${fileInput.name}_token"]`);
+                fileInput.disabled = Boolean(tokenInput && tokenInput.value);
+            });
+        }
+
+        // Validate the form on the server without its files, so the
+        // documents are only uploaded by a submit that will succeed.
+        // Resolves to true when the form can be submitted.
+        function validateOnServer() {
+            const validateUrl = form && form.dataset.validateUrl;
+            if (!validateUrl) {
+                return Promise.resolve(true);
+            }
+            const formData = new FormData(form);
+            form.querySelectorAll('input[type="file"]').forEach((input) => {
+                formData.delete(input.name);
+                if (hasFile(input)) {
+                    formData.append('files', input.name);
+                }
+            });
+            return fetch(validateUrl, { method: 'POST', body: formData, credentials: 'same-origin' })
+                .then(response => response.ok ? response.json() : Promise.reject(response.status))
+                .then(result => {
+                    if (result.valid) {
+                        return true;
+                    }
+                    const messagesByStep = new Map();
+                    result.errors.forEach((error) => {
+                        const fieldName = error.fields.find(name => getField(name));
+                        if (fieldName) {
+                            markInvalid(getFields(fieldName));
+                        }
+                        const stepElement = (fieldName && getField(fieldName).closest('.form-step'))
+                            || document.querySelector(`.form-step[data-step="${totalSteps}"]`);
+                        if (!messagesByStep.has(stepElement)) {
+                            messagesByStep.set(stepElement, []);
+                        }
+                        messagesByStep.get(stepElement).push(error.message);
+                    });
+                    let firstStep = totalSteps;
+                    messagesByStep.forEach((messages, stepElement) => {
+                        showStepError(stepElement, messages);
+                        firstStep = Math.min(firstStep, parseInt(stepElement.dataset.step, 10));
+                    });
+                    currentStep = firstStep;
+                    showStep(currentStep);
+                    return false;
+                })
+                .catch((error) => {
+                    // Let the regular submit report the errors
+                    console.error('Server validation failed:', error);
+                    return true;
+                });
+        }
+
         // Submit button click handler
         if (submitBtn) {
             submitBtn.addEventListener('click', function(e) {
@@ -996,9 +1190,17 @@ console.log('=== Career Application Form JS Loaded ===');
 
                 const result = validateAllSteps();
                 if (result.valid) {
-                    console.log('Validation passed, submitting form');
+                    console.log('Validation passed, validating on the server');
                     if (form) {
-                        form.submit();
+                        submitBtn.disabled = true;
+                        Promise.all(pendingUploads.values()).then(validateOnServer).then((valid) => {
+                            submitBtn.disabled = false;
+                            if (valid) {
+                                console.log('Server validation passed, submitting form');
+                                disableStagedFileInputs();
+                                form.submit();
+                            }
+                        });
                     }
                 } else {
                     console.log('Validation failed');
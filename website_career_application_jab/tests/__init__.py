@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+from . import test_application_rules
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# License LGPL-3
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import Command, fields
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestApplicationRules(TransactionCase):
+    """
+    The rule table must report what the per-field constraints it replaced
+    reported, each case below is one of their checks
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Application = cls.env['coflow.career.application']
+        departments = cls.env['coflow.hospital.department'].create([
+            {'name': name} for name in ('Dahiliye', 'Cerrahi', 'Kardiyoloji')
+        ])
+        cls.doc = cls.env['ir.attachment'].create({'name': 'belge.pdf', 'raw': b'%PDF-1.4'})
+        cls.today = fields.Date.today()
+        cls.vals = {
+            'full_name': 'Ayşe Yılmaz',
+            'gender': 'kadin',
+            'birth_date': cls.today - relativedelta(years=30),
+            'birth_place': 'Ankara',
+            'birth_country': 'Türkiye',
+            'marital_status': 'bekar',
+            'addr_mahalle': 'Kızılay',
+            'addr_cadde': 'Atatürk',
+            'addr_sokak': 'Gazi',
+            'addr_apt_no': '1',
+            'addr_daire_no': '2',
+            'addr_postcode': '06420',
+            'addr_district': 'Çankaya',
+            'addr_city': 'Ankara',
+            'addr_country': 'tr',
+            'phone': '+90 (312) 555-1234',
+            'email': 'ayse@example.com',
+            'passport_has': 'hayir',
+            'disability': 'yok',
+            'criminal_record': 'yok',
+            'criminal_record_doc_id': cls.doc.id,
+            'family_reunion': 'hayir',
+            'german_level': 'b2',
+            'has_language_certificate': 'hayir',
+            'recognition_status': 'hayir',
+            'choice1': departments[0].id,
+            'choice2': departments[1].id,
+            'choice3': departments[2].id,
+            'motivation_text': 'Motivasyon',
+            'consent_ok': True,
+            'consent_name': 'Ayşe Yılmaz',
+        }
+        spouse = {
+            'family_reunion': 'evet',
+            'has_spouse': True,
+            'spouse_name': 'Mehmet Yılmaz',
+            'spouse_birth_date': cls.today - relativedelta(years=32),
+            'spouse_birth_place': 'İzmir',
+            'spouse_phone': '+90 532 555 1234',
+            'spouse_email': 'mehmet@example.com',
+            'spouse_passport_has': 'hayir',
+            'spouse_german_certificate': 'hayir',
+        }
+        tecilli = {'gender': 'erkek', 'military_status': 'tecilli',
+                   'military_postpone_until': cls.today, 'military_postpone_doc_id': cls.doc.id}
+        passport = {'passport_has': 'evet', 'passport_no': 'U1234567',
+                    'passport_valid_until': cls.today, 'passport_photo_id': cls.doc.id}
+        spouse_passport = dict(spouse, spouse_passport_has='evet', spouse_passport_no='U7654321',
+                               spouse_passport_valid_until=cls.today, spouse_passport_photo_id=cls.doc.id)
+        recognition = {'recognition_status': 'devam-ediyor', 'recognition_state': 'berlin',
+                       'recognition_applied_at': cls.today, 'recognition_received_at': cls.today}
+        # (values changed on the valid application, message of the old constraint)
+        cls.cases = [
+            # _check_email
+            ({'email': 'ayse@example'}, 'Geçersiz e-posta adresi formatı!'),
+            # _check_phone
+            ({'phone': '0312 555 12a4'}, 'Geçersiz telefon numarası formatı!'),
+            ({'phone': '+90 312 55'}, 'Telefon numarası en az 10 rakam içermelidir!'),
+            # _check_spouse_email, _check_spouse_phone
+            (dict(spouse, spouse_email='mehmet@'), 'Geçersiz eş e-posta adresi formatı!'),
+            (dict(spouse, spouse_phone='532/555'), 'Geçersiz eş telefon numarası formatı!'),
+            # _check_birth_date
+            ({'birth_date': cls.today}, 'Doğum tarihi bugünden önce olmalıdır!'),
+            ({'birth_date': cls.today - relativedelta(years=17)}, 'Başvuru sahibi en az 18 yaşında olmalıdır!'),
+            # _check_military_status, _check_military_postponement
+            ({'gender': 'erkek'}, 'Erkek başvuru sahipleri için askerlik durumu zorunludur!'),
+            (dict(tecilli, military_postpone_until=False), 'Tecilli askerlik için tecil bitiş tarihi zorunludur!'),
+            (dict(tecilli, military_postpone_doc_id=False), 'Tecilli askerlik için tecil belgesi zorunludur!'),
+            # _check_passport_fields, _check_passport_validity
+            (dict(passport, passport_no=False), 'Pasaport var olarak işaretlendi, pasaport numarası zorunludur!'),
+            (dict(passport, passport_valid_until=False), 'Pasaport var olarak işaretlendi, geçerlilik tarihi zorunludur!'),
+            (dict(passport, passport_photo_id=False), 'Pasaport var olarak işaretlendi, pasaport fotoğrafı zorunludur!'),
+            (dict(passport, passport_valid_until=cls.today - relativedelta(days=1)), 'Pasaport geçerlilik tarihi geçmiş olamaz!'),
+            # _check_disability_fields
+            ({'disability': 'var', 'disability_doc_id': cls.doc.id}, 'Engellilik var olarak işaretlendi, açıklama zorunludur!'),
+            ({'disability': 'var', 'disability_note': 'Not'}, 'Engellilik var olarak işaretlendi, belge zorunludur!'),
+            # _check_criminal_record
+            ({'criminal_record_doc_id': False}, 'Adli sicil belgesi zorunludur!'),
+            # _check_children_count, _check_children_records
+            ({'family_reunion': 'evet', 'children_count': 3}, 'Çocuk sayısı 0-2 arasında olmalıdır!'),
+            ({'family_reunion': 'evet', 'children_count': 1}, 'Çocuk sayısı 1 olarak belirtildi, ancak 0 çocuk kaydı var!'),
+            # _check_spouse_fields
+            (dict(spouse, spouse_name=False), 'Eş ekle işaretlendi, eş adı soyadı zorunludur!'),
+            (dict(spouse, spouse_birth_date=False), 'Eş ekle işaretlendi, eş doğum tarihi zorunludur!'),
+            (dict(spouse, spouse_birth_place=False), 'Eş ekle işaretlendi, eş doğum yeri zorunludur!'),
+            (dict(spouse, spouse_phone=False), 'Eş ekle işaretlendi, eş telefon zorunludur!'),
+            (dict(spouse, spouse_email=False), 'Eş ekle işaretlendi, eş e-posta zorunludur!'),
+            (dict(spouse, spouse_passport_has=False), 'Eş ekle işaretlendi, eş pasaport durumu zorunludur!'),
+            (dict(spouse, spouse_german_certificate=False), 'Eş ekle işaretlendi, eş Almanca sertifikası durumu zorunludur!'),
+            # _check_spouse_passport
+            (dict(spouse_passport, spouse_passport_no=False),
+             'Eş pasaportu var olarak işaretlendi, pasaport numarası zorunludur!'),
+            (dict(spouse_passport, spouse_passport_valid_until=False),
+             'Eş pasaportu var olarak işaretlendi, geçerlilik tarihi zorunludur!'),
+            (dict(spouse_passport, spouse_passport_photo_id=False),
+             'Eş pasaportu var olarak işaretlendi, pasaport fotoğrafı zorunludur!'),
+            # _check_language_certificate
+            ({'has_language_certificate': 'evet', 'language_certificate_doc_id': cls.doc.id},
+             'Dil sertifikası var olarak işaretlendi, sertifika türü zorunludur!'),
+            ({'has_language_certificate': 'evet', 'language_certificate_type': 'goethe'},
+             'Dil sertifikası var olarak işaretlendi, sertifika belgesi zorunludur!'),
+            # _check_recognition_fields
+            (dict(recognition, recognition_state=False),
+             'Denklik yapıldı/devam ediyor olarak işaretlendi, eyalet zorunludur!'),
+            (dict(recognition, recognition_applied_at=False),
+             'Denklik yapıldı/devam ediyor olarak işaretlendi, başvuru tarihi zorunludur!'),
+            (dict(recognition, recognition_received_at=False),
+             'Denklik yapıldı/devam ediyor olarak işaretlendi, alış tarihi zorunludur!'),
+            # _check_choices_unique
+            ({'choice3': departments[0].id}, 'Üç tercih de birbirinden farklı olmalıdır!'),
+            # _check_consent
+            ({'consent_ok': False}, 'Başvuruyu göndermek için onay kutusunu işaretlemelisiniz!'),
+        ]
+        # Filled in sections that break no rule
+        cls.valid_cases = [
+            spouse, tecilli, passport, spouse_passport, recognition,
+            {'family_reunion': 'evet', 'children_count': 1, 'child_ids': [Command.create({
+                'name': 'Can Yılmaz',
+                'age': 5,
+                'birth_date': cls.today - relativedelta(years=5),
+                'birth_place': 'Ankara',
+            })]},
+        ]
+
+    def _get_messages(self, vals):
+        """Helper method returning the rule violations of an application built from vals"""
+        record = self.Application.new(dict(self.vals, **vals))
+        return [message for field_names, message in record._get_rule_violations()]
+
+    def test_rule_table_matches_constraints(self):
+        self.assertEqual(self._get_messages({}), [])
+        for vals in self.valid_cases:
+            with self.subTest(vals=vals):
+                self.assertEqual(self._get_messages(vals), [])
+        for vals, message in self.cases:
+            with self.subTest(message=message):
+                self.assertIn(message, self._get_messages(vals))
+
+    def test_write_checks_rules_of_written_fields(self):
+        application = self.Application.create(dict(
+            self.vals, passport_has='evet', passport_no='U1234567',
+            passport_valid_until=self.today, passport_photo_id=self.doc.id))
+        with self.assertRaisesRegex(ValidationError, 'Geçersiz telefon numarası formatı!'):
+            application.write({'phone': 'telefon'})
+        with self.assertRaisesRegex(ValidationError, 'Pasaport geçerlilik tarihi geçmiş olamaz!'):
+            application.write({'passport_valid_until': self.today - relativedelta(days=1)})
+
+        # The passport expires after the application was submitted
+        self.env.cr.execute(
+            "UPDATE coflow_career_application SET passport_valid_until = %s WHERE id = %s",
+            [self.today - relativedelta(days=1), application.id])
+        application.invalidate_recordset(['passport_valid_until'])
+        application.write({'phone': '+90 312 555 0000'})
+        self.assertEqual(application.phone, '+90 312 555 0000')